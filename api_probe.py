@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+In-process API probes shared by the setup test scripts
+
+The scripts await these from the one event loop they run under, rather than each
+probe starting and tearing down a loop of its own.
+"""
+import asyncio
+from typing import List
+
+import httpx
+
+
+async def probe_endpoints(*paths: str) -> List[httpx.Response]:
+    """GET each path against the FastAPI app concurrently and return the responses in order"""
+    from app.main import app
+    
+    # ASGITransport calls the app directly (no socket), and one client serves every probe
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(client.get(path) for path in paths))
@@ -8,21 +8,18 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.schemas.product import Product, ProductCreate, ProductUpdate
-from app.services.product_discovery import get_product_by_id, get_products, create_product, update_product, delete_product, discover_trending_products
+from app.services.product_discovery import get_product_by_id, get_products, create_product, update_product, delete_product, discover_trending_products, discover_trending_products_from_api
 
 router = APIRouter()
 
 
 @router.get("/test-api-connection")
-def test_api_connection():
+async def test_api_connection():
     """
     Test external API connection without database dependency
     """
-    from app.services.product_discovery import discover_trending_products_from_api
-    import asyncio
-    
     try:
-        raw_products = asyncio.run(discover_trending_products_from_api())
+        raw_products = await discover_trending_products_from_api()
         return {
             "status": "success",
             "products_discovered": len(raw_products),
@@ -37,7 +34,7 @@ def test_api_connection():
 
 
 @router.post("/discover-trending", status_code=status.HTTP_202_ACCEPTED)
-def discover_trending_products_endpoint(db: Session = Depends(get_db)):
+async def discover_trending_products_endpoint(db: Session = Depends(get_db)):
     """
     Discover trending products from external sources
     """
@@ -48,7 +45,7 @@ def discover_trending_products_endpoint(db: Session = Depends(get_db)):
     
     # For now, execute synchronously for demonstration
     try:
-        discovered_products = discover_trending_products(db)
+        discovered_products = await discover_trending_products(db)
         return {
             "status": "completed",
             "products_discovered": len(discovered_products),
@@ -56,10 +53,7 @@ def discover_trending_products_endpoint(db: Session = Depends(get_db)):
         }
     except Exception as e:
         # If database fails, still return the API data
-        from app.services.product_discovery import discover_trending_products_from_api
-        import asyncio
-        
-        raw_products = asyncio.run(discover_trending_products_from_api())
+        raw_products = await discover_trending_products_from_api()
         return {
             "status": "completed_without_database", 
             "products_discovered": len(raw_products),
@@ -0,0 +1,49 @@
+"""
+Redis-backed response cache for the AI Content Factory application
+"""
+import asyncio
+import json
+import weakref
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.logging import logger
+
+# Redis connections are bound to the event loop that opened them, so keep one client per loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.Redis]" = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> redis.Redis:
+    """
+    Get the Redis client for the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5)
+        _clients[loop] = client
+    return client
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """
+    Get a cached JSON value, treating an unavailable Redis as a cache miss
+    """
+    try:
+        value = await get_redis().get(key)
+    except Exception as e:
+        logger.debug(f"Cache read failed for {key}: {e}")
+        return None
+    return json.loads(value) if value is not None else None
+
+
+async def cache_set_json(key: str, value: Any, ttl: int) -> None:
+    """
+    Cache a JSON-serializable value for ``ttl`` seconds; failures are logged and ignored
+    """
+    try:
+        await get_redis().setex(key, ttl, json.dumps(value))
+    except Exception as e:
+        logger.debug(f"Cache write failed for {key}: {e}")
@@ -2,6 +2,7 @@
 Configuration settings for the AI Content Factory application
 """
 import os
+from functools import lru_cache
 from typing import List, Optional
 
 from pydantic_settings import BaseSettings
@@ -42,6 +43,11 @@ class Settings(BaseSettings):
     YOUTUBE_CLIENT_ID: str = ""
     YOUTUBE_CLIENT_SECRET: str = ""
     YOUTUBE_CLIENT_SECRET_FILE: str = "google_client_secret.json"
+    # Videos up to YOUTUBE_IN_MEMORY_UPLOAD_MAX_BYTES upload as one plain multipart request;
+    # up to YOUTUBE_SINGLE_REQUEST_UPLOAD_MAX_BYTES in one resumable request; larger ones in chunks
+    YOUTUBE_IN_MEMORY_UPLOAD_MAX_BYTES: int = 5 * 1024 * 1024
+    YOUTUBE_SINGLE_REQUEST_UPLOAD_MAX_BYTES: int = 100 * 1024 * 1024
+    YOUTUBE_UPLOAD_CHUNKSIZE: int = 8 * 1024 * 1024
 
     # E-commerce API keys
     ECOMMERCE_API_KEY: str = ""
@@ -88,4 +94,12 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Get the application settings, parsing the environment and .env only once per process
+    """
+    return Settings()
+
+
+settings = get_settings()
\ No newline at end of file
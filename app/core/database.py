@@ -1,17 +1,27 @@
 """
 Database configuration for the AI Content Factory application
 """
+from contextlib import contextmanager
+from typing import Iterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
 # Create database engine with proper encoding settings
 # Use SQLite for testing when DATABASE_URL is not set
 if settings.DATABASE_URL:
+    # LIFO hands back the most recently used connection, so a mostly idle pool keeps one
+    # warm connection instead of cycling through ones the server may have dropped
     engine = create_engine(
         settings.DATABASE_URL, 
+        poolclass=QueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_use_lifo=True,
         pool_pre_ping=True,
         pool_recycle=300,
         echo=False,
@@ -37,4 +47,35 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def ping() -> bool:
+    """
+    Check database connectivity on a pooled connection
+
+    Uses the dialect's own ping (the same check as ``pool_pre_ping``) on the raw DBAPI
+    connection, skipping SQLAlchemy statement compilation and result processing.
+    """
+    connection = engine.raw_connection()
+    try:
+        return engine.dialect.do_ping(connection.dbapi_connection)
+    finally:
+        connection.close()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Provide a transactional session for work outside a request (Celery tasks, scripts):
+    commits on success, rolls back on error and always closes
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
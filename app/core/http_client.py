@@ -0,0 +1,90 @@
+"""
+Shared HTTP clients for the AI Content Factory application
+"""
+import asyncio
+import weakref
+from typing import Callable
+
+import httpx
+
+# Pooled connections are bound to the event loop that opened them, so keep one client per loop.
+# Under FastAPI that is a single app-wide client; Celery tasks get one per worker loop.
+_ClientRegistry = weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]
+_clients: _ClientRegistry = weakref.WeakKeyDictionary()
+_concurrent_clients: _ClientRegistry = weakref.WeakKeyDictionary()
+_graph_api_clients: _ClientRegistry = weakref.WeakKeyDictionary()
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+GRAPH_API_BASE_URL = "https://graph.facebook.com/v18.0"
+
+
+def _get_or_create(registry: _ClientRegistry, factory: Callable[[], httpx.AsyncClient]) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = registry.get(loop)
+    if client is None or client.is_closed:
+        client = factory()
+        registry[loop] = client
+    return client
+
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=True)
+
+
+def _create_concurrent_client() -> httpx.AsyncClient:
+    try:
+        import aiohttp
+        from httpx_aiohttp import AiohttpTransport
+    except ImportError:
+        return _create_client()
+
+    transport = AiohttpTransport(
+        client=lambda: aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=200, limit_per_host=50, keepalive_timeout=75)
+        )
+    )
+    return httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
+
+
+def _create_graph_api_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(base_url=GRAPH_API_BASE_URL, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=True)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client for the running event loop
+    """
+    return _get_or_create(_clients, _create_client)
+
+
+def get_concurrent_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client for high fan-out paths such as LLM calls
+
+    Backed by aiohttp's connection pool when httpx-aiohttp is installed, which holds up
+    far better than httpx's native pool under many concurrent requests.
+    """
+    return _get_or_create(_concurrent_clients, _create_concurrent_client)
+
+
+def get_graph_api_client() -> httpx.AsyncClient:
+    """
+    Get the HTTP/2 client for the Facebook Graph API (Instagram publishing)
+
+    Requests take paths relative to ``GRAPH_API_BASE_URL``. Every publish is a create-media
+    then publish pair, so concurrent posts multiplex over one connection.
+    """
+    return _get_or_create(_graph_api_clients, _create_graph_api_client)
+
+
+async def close_http_client() -> None:
+    """
+    Close the pooled HTTP clients for the running event loop, if any were created
+    """
+    loop = asyncio.get_running_loop()
+    for registry in (_clients, _concurrent_clients, _graph_api_clients):
+        client = registry.pop(loop, None)
+        if client is not None:
+            await client.aclose()
@@ -1,10 +1,13 @@
 """
 Logging configuration for the AI Content Factory application
 """
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
-from typing import Dict, Any
+import queue
+from typing import Dict, Any, Iterable, Optional
 
 from app.core.config import settings
 
@@ -106,6 +109,7 @@ def setup_logging() -> None:
     # Configure logging
     logging_config = get_logging_config()
     logging.config.dictConfig(logging_config)
+    _route_through_queue(logging_config["loggers"])
     
     # Set logging level based on environment
     root_logger = logging.getLogger()
@@ -117,5 +121,38 @@ def setup_logging() -> None:
         root_logger.setLevel(logging.INFO)
 
 
+def _route_through_queue(logger_names: Iterable[str]) -> None:
+    """
+    Swap the configured handlers for a QueueHandler so logging calls on the event loop
+    only enqueue the record; a QueueListener thread does the console and file writes
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    handlers = []
+    for name in logger_names:
+        configured = logging.getLogger(name)
+        for handler in configured.handlers:
+            if handler not in handlers:
+                handlers.append(handler)
+        configured.handlers = [queue_handler]
+    
+    _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def _stop_queue_listener() -> None:
+    # Drain queued records before the interpreter exits
+    if _queue_listener is not None:
+        _queue_listener.stop()
+
+
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+atexit.register(_stop_queue_listener)
+
+
 # Create a logger instance that can be used throughout the application
 logger = logging.getLogger("app")
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Shared Supabase client for the AI Content Factory application
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Sequence, Union
+
+from supabase import Client, create_client
+
+from app.core.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_supabase_client() -> Client:
+    """
+    Get the process-wide Supabase client, created on first use so its HTTP
+    connections are reused by every caller
+    """
+    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+
+
+def check_tables(client: Client, names: Sequence[str]) -> List[Optional[Union[str, Exception]]]:
+    """
+    Check that each of the given public tables exists, returning None for a table that
+    does and an error for one that doesn't, in the order the names were given
+    """
+    names = list(names)
+    # check_tables() is created by setup_db_supabase.py and answers for every table in one call
+    try:
+        statuses = client.rpc("check_tables", {"names": names}).execute().data
+    except Exception:
+        statuses = None
+    if isinstance(statuses, dict):
+        return [None if statuses.get(name) else "table does not exist" for name in names]
+
+    # Older databases don't have the function: probe the tables themselves, all at once
+    def probe(name: str) -> Optional[Exception]:
+        try:
+            client.table(name).select("*").limit(1).execute()
+            return None
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=len(names) or 1) as executor:
+        return list(executor.map(probe, names))
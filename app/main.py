@@ -1,20 +1,50 @@
 """
 Main application entry point for the AI Content Factory
 """
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.core.logging import setup_logging
+from app.core.database import ping
+from app.core.http_client import close_http_client, get_http_client
+from app.core.logging import logger, setup_logging
 from app.api.routes import products, videos, social_media, monitoring, analytics
 
 # Set up logging
 setup_logging()
 
+
+def _warm_database_pool() -> None:
+    try:
+        ping()
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared HTTP connection pool up front and close it on shutdown
+    app.state.http_client = get_http_client()
+    # Build the OpenAPI schema now (FastAPI caches it) rather than on the first /docs hit,
+    # and open a pooled DB connection in the background so startup never waits on the database
+    app.openapi()
+    app.state.db_warmup = asyncio.create_task(asyncio.to_thread(_warm_database_pool))
+    yield
+    # Don't leave the warm-up pending past shutdown; the ping itself ends on its own in its thread
+    app.state.db_warmup.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.db_warmup
+    await close_http_client()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
-    version=settings.PROJECT_VERSION
+    version=settings.PROJECT_VERSION,
+    lifespan=lifespan
 )
 
 # Set up CORS
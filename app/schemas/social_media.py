@@ -4,7 +4,7 @@ Social media schemas for the AI Content Factory application
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class SocialMediaPostBase(BaseModel):
@@ -36,8 +36,7 @@ class SocialMediaPostInDBBase(SocialMediaPostBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SocialMediaPost(SocialMediaPostInDBBase):
@@ -6,6 +6,8 @@ import asyncio
 from typing import Dict, Any, Optional
 
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.logging import logger
 
 
 async def create_avatar_video(script: str, avatar_settings: Dict[str, Any]) -> str:
@@ -23,7 +25,7 @@ async def create_avatar_video(script: str, avatar_settings: Dict[str, Any]) -> s
             # Try HeyGen API first
             return await _create_heygen_video(script, avatar_settings)
         except Exception as e:
-            print(f"HeyGen API failed: {e}")
+            logger.warning(f"HeyGen API failed, falling back: {e}")
             # Fall back to other providers or mock
     
     # Try alternative providers or return mock video
@@ -35,39 +37,40 @@ async def _create_heygen_video(script: str, avatar_settings: Dict[str, Any]) ->
     Create video using HeyGen API
     """
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            # Create video
-            response = await client.post(
-                f"{settings.AI_AVATAR_API_URL}/v1/video/generate",
-                json={
-                    "video": {
-                        "title": avatar_settings.get("title", "AI Generated Video"),
-                        "description": avatar_settings.get("description", "Generated by AI Content Factory"),
-                        "ratio": avatar_settings.get("ratio", "16:9"),
-                        "avatar_id": avatar_settings.get("avatar_id", "default_avatar"),
-                        "voice_id": avatar_settings.get("voice_id", "default_voice"),
-                        "background": avatar_settings.get("background", "default_background"),
-                        "scene": [
-                            {
-                                "avatar": avatar_settings.get("avatar_id", "default_avatar"),
-                                "voice": avatar_settings.get("voice_id", "default_voice"),
-                                "text": script
-                            }
-                        ]
-                    }
-                },
-                headers={
-                    "X-Api-Key": settings.AI_AVATAR_API_KEY,
-                    "Content-Type": "application/json"
+        client = get_http_client()
+        # Create video
+        response = await client.post(
+            f"{settings.AI_AVATAR_API_URL}/v1/video/generate",
+            json={
+                "video": {
+                    "title": avatar_settings.get("title", "AI Generated Video"),
+                    "description": avatar_settings.get("description", "Generated by AI Content Factory"),
+                    "ratio": avatar_settings.get("ratio", "16:9"),
+                    "avatar_id": avatar_settings.get("avatar_id", "default_avatar"),
+                    "voice_id": avatar_settings.get("voice_id", "default_voice"),
+                    "background": avatar_settings.get("background", "default_background"),
+                    "scene": [
+                        {
+                            "avatar": avatar_settings.get("avatar_id", "default_avatar"),
+                            "voice": avatar_settings.get("voice_id", "default_voice"),
+                            "text": script
+                        }
+                    ]
                 }
-            )
-            response.raise_for_status()
-            result = response.json()
-            
-            # Wait for video generation to complete
-            video_id = result["data"]["video_id"]
-            video_url = await poll_for_video_completion(video_id)
-            return video_url
+            },
+            headers={
+                "X-Api-Key": settings.AI_AVATAR_API_KEY,
+                "Content-Type": "application/json"
+            },
+            timeout=60.0
+        )
+        response.raise_for_status()
+        result = response.json()
+        
+        # Wait for video generation to complete
+        video_id = result["data"]["video_id"]
+        video_url = await poll_for_video_completion(video_id)
+        return video_url
         
     except httpx.HTTPError as e:
         raise Exception(f"HeyGen HTTP error: {e}")
@@ -100,29 +103,29 @@ async def poll_for_video_completion(video_id: str) -> str:
     max_attempts = 30
     attempt = 0
     
-    async with httpx.AsyncClient() as client:
-        while attempt < max_attempts:
-            try:
-                response = await client.get(
-                    f"{settings.AI_AVATAR_API_URL}/v1/video/{video_id}",
-                    headers={"X-Api-Key": settings.AI_AVATAR_API_KEY}
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                status = result["data"]["status"]
-                if status == "completed":
-                    return result["data"]["download_url"]
-                elif status == "failed":
-                    raise Exception(f"Video generation failed: {result.get('error', 'Unknown error')}")
-                
-            except httpx.HTTPError as e:
-                print(f"HTTP error while polling for video completion: {e}")
-                # Continue to next attempt
+    client = get_http_client()
+    while attempt < max_attempts:
+        try:
+            response = await client.get(
+                f"{settings.AI_AVATAR_API_URL}/v1/video/{video_id}",
+                headers={"X-Api-Key": settings.AI_AVATAR_API_KEY}
+            )
+            response.raise_for_status()
+            result = response.json()
+            
+            status = result["data"]["status"]
+            if status == "completed":
+                return result["data"]["download_url"]
+            elif status == "failed":
+                raise Exception(f"Video generation failed: {result.get('error', 'Unknown error')}")
             
-            # Wait before polling again
-            await asyncio.sleep(10)
-            attempt += 1
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error while polling for video completion: {e}", exc_info=True)
+            # Continue to next attempt
+        
+        # Wait before polling again
+        await asyncio.sleep(10)
+        attempt += 1
     
     raise Exception("Video generation timed out")
 
@@ -158,16 +161,16 @@ async def get_available_avatars() -> Dict[str, Any]:
     Get a list of available avatars from HeyGen
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.AI_AVATAR_API_URL}/v1/avatars",
-                headers={"X-Api-Key": settings.AI_AVATAR_API_KEY}
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result
+        client = get_http_client()
+        response = await client.get(
+            f"{settings.AI_AVATAR_API_URL}/v1/avatars",
+            headers={"X-Api-Key": settings.AI_AVATAR_API_KEY}
+        )
+        response.raise_for_status()
+        result = response.json()
+        return result
     except httpx.HTTPError as e:
-        print(f"HTTP error occurred while fetching avatars: {e}")
+        logger.error(f"HTTP error occurred while fetching avatars: {e}", exc_info=True)
         # Return sample data as fallback
         return {
             "avatars": [
@@ -186,7 +189,7 @@ async def get_available_avatars() -> Dict[str, Any]:
             ]
         }
     except Exception as e:
-        print(f"Error fetching avatars: {e}")
+        logger.error(f"Error fetching avatars: {e}", exc_info=True)
         # Return sample data as fallback
         return {
             "avatars": [
@@ -140,9 +140,9 @@ class AutomatedContentPublisher:
             # Generate AI script (use cast to fix type checking)
             product_id = cast(int, product.id)
             
-            script = generate_video_script(product_id, self.db)
+            script = await generate_video_script(product)
             
-            if not script or script == "Product not found":
+            if not script:
                 return None
             
             # Create video record
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from app.models.product import Product
 from app.models.video import Video
 from app.models.social_media import SocialMediaPost
-from app.services.product_discovery import discover_trending_products, analyze_product_trend_score
+from app.services.product_discovery import discover_trending_products, analyze_product_trend_scores, get_product_by_id
 from app.services.video_generation import generate_video_script, create_video_for_product
 from app.services.ai_avatar import create_avatar_video
 from app.services.social_media_publisher import publish_to_multiple_platforms
@@ -36,7 +36,7 @@ async def execute_full_content_workflow(db: Session) -> Dict[str, Any]:
     try:
         # Step 1: Discover trending products
         workflow_result["steps"].append("Discovering trending products...")
-        trending_products = discover_trending_products(db)
+        trending_products = await discover_trending_products(db)
         workflow_result["products_discovered"] = len(trending_products)
         
         if not trending_products:
@@ -46,23 +46,16 @@ async def execute_full_content_workflow(db: Session) -> Dict[str, Any]:
         
         # Step 2: Analyze and select the best product
         workflow_result["steps"].append("Analyzing product trend scores...")
-        best_product = None
-        best_score = 0
-        
-        for product in trending_products:
-            score = analyze_product_trend_score(product)
-            if score > best_score:
-                best_score = score
-                best_product = product
-        
-        if not best_product:
-            best_product = trending_products[0]  # Fallback to first product
+        scores = analyze_product_trend_scores(trending_products)
+        best_index = max(range(len(scores)), key=scores.__getitem__)
+        best_product = trending_products[best_index]
+        best_score = scores[best_index]
         
         workflow_result["steps"].append(f"Selected product: {best_product.name} (Score: {best_score:.1f})")
         
         # Step 3: Generate video script
         workflow_result["steps"].append("Generating video script...")
-        script = generate_video_script(best_product.id, db)
+        script = await generate_video_script(best_product)
         
         # Step 4: Create AI avatar video
         workflow_result["steps"].append("Creating AI avatar video...")
@@ -80,7 +73,7 @@ async def execute_full_content_workflow(db: Session) -> Dict[str, Any]:
         
         # Step 5: Create video record in database
         workflow_result["steps"].append("Saving video to database...")
-        video = create_video_for_product(best_product.id, db)
+        video = await create_video_for_product(best_product.id, db, video_url=video_url, script=script)
         if video:
             workflow_result["videos_created"] = 1
             workflow_result["steps"].append(f"Video saved with ID: {video.id}")
@@ -130,9 +123,9 @@ async def create_content_for_product(db: Session, product_id: int) -> Dict[str,
     }
     
     try:
-        # Get the product
-        from app.services.product_discovery import get_product_by_id
-        product = get_product_by_id(db, product_id)
+        # Get the product off the event loop so concurrent workflows keep running; the
+        # lookup in create_video_for_product then hits the session's identity map
+        product = await asyncio.to_thread(get_product_by_id, db, product_id)
         if not product:
             result["status"] = "failed"
             result["errors"].append(f"Product with ID {product_id} not found")
@@ -142,7 +135,7 @@ async def create_content_for_product(db: Session, product_id: int) -> Dict[str,
         
         # Generate video script
         result["steps"].append("Generating video script...")
-        script = generate_video_script(product_id, db)
+        script = await generate_video_script(product)
         
         # Create AI avatar video
         result["steps"].append("Creating AI avatar video...")
@@ -160,7 +153,7 @@ async def create_content_for_product(db: Session, product_id: int) -> Dict[str,
         
         # Create video record in database
         result["steps"].append("Saving video to database...")
-        video = create_video_for_product(product_id, db)
+        video = await create_video_for_product(product_id, db, video_url=video_url, script=script)
         if video:
             result["video_id"] = video.id
             result["steps"].append(f"Video saved with ID: {video.id}")
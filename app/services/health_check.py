@@ -9,17 +9,36 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import engine
+from app.core.http_client import get_http_client
 from app.core.logging import logger
 
 
+DATABASE_STATS_QUERY = text(
+    "SELECT "
+    "(SELECT COUNT(*) FROM products), "
+    "(SELECT COUNT(*) FROM videos), "
+    "(SELECT COUNT(*) FROM social_media_posts)"
+)
+
+
+def _ping_database(db: Session) -> None:
+    """Blocking SQLAlchemy round trip used by check_database_health"""
+    db.execute(text("SELECT 1")).fetchone()
+
+
+def _ping_supabase() -> None:
+    """Blocking Supabase REST round trip used as the database health fallback"""
+    from app.core.supabase_client import get_supabase_client
+    get_supabase_client().table('products').select('*').limit(1).execute()
+
+
 async def check_database_health(db: Session) -> Dict[str, Any]:
     """
     Check database health with fallback to Supabase REST API
     """
     try:
-        # Try direct database connection first
-        result = db.execute(text("SELECT 1"))
-        result.fetchone()
+        # Try direct database connection first, off the event loop so other checks can proceed
+        await asyncio.to_thread(_ping_database, db)
         return {
             "status": "healthy",
             "message": "Database connection successful (SQLAlchemy)"
@@ -29,9 +48,7 @@ async def check_database_health(db: Session) -> Dict[str, Any]:
         
         # Fallback to Supabase REST API
         try:
-            from supabase import create_client
-            supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-            result = supabase.table('products').select('*').limit(1).execute()
+            await asyncio.to_thread(_ping_supabase)
             return {
                 "status": "healthy",
                 "message": "Database connection successful (Supabase REST API)"
@@ -78,18 +95,18 @@ async def check_external_api_health() -> Dict[str, Any]:
     Check external API health (FakeStoreAPI as an example)
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://fakestoreapi.com/products", timeout=10)
-            if response.status_code == 200:
-                return {
-                    "status": "healthy",
-                    "message": "External API connection successful"
-                }
-            else:
-                return {
-                    "status": "unhealthy",
-                    "message": f"External API returned status code {response.status_code}"
-                }
+        client = get_http_client()
+        response = await client.get("https://fakestoreapi.com/products", timeout=10)
+        if response.status_code == 200:
+            return {
+                "status": "healthy",
+                "message": "External API connection successful"
+            }
+        else:
+            return {
+                "status": "unhealthy",
+                "message": f"External API returned status code {response.status_code}"
+            }
     except Exception as e:
         logger.error(f"External API health check failed: {e}", exc_info=True)
         return {
@@ -228,14 +245,11 @@ async def get_application_status(db: Session) -> Dict[str, Any]:
         
         # Get database stats (example)
         try:
-            product_result = db.execute(text("SELECT COUNT(*) FROM products")).fetchone()
-            product_count = product_result[0] if product_result is not None else 0
-            
-            video_result = db.execute(text("SELECT COUNT(*) FROM videos")).fetchone()
-            video_count = video_result[0] if video_result is not None else 0
-            
-            post_result = db.execute(text("SELECT COUNT(*) FROM social_media_posts")).fetchone()
-            post_count = post_result[0] if post_result is not None else 0
+            # Fetch all counts in a single round trip. These are exact counts;
+            # on very large Postgres tables pg_class.reltuples would be O(1)
+            # but only as fresh as the last ANALYZE, so we keep COUNT(*) here.
+            counts = db.execute(DATABASE_STATS_QUERY).fetchone()
+            product_count, video_count, post_count = counts if counts is not None else (0, 0, 0)
         except Exception as e:
             logger.error(f"Error getting database stats: {e}", exc_info=True)
             product_count = video_count = post_count = "Error"
@@ -3,18 +3,36 @@ Product discovery service for the AI Content Factory application
 """
 import httpx
 import asyncio
-from typing import List, Optional, Dict, Any, cast
+import random
+import time
+from typing import List, Optional, Dict, Any, Union, cast
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import lambda_stmt, select, update
 from sqlalchemy.orm import Session
 
+from app.core.cache import cache_get_json, cache_set_json
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from app.core.logging import logger
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.utils.json_stream import iter_json_items
+
+
+# FakeStoreAPI returns the same catalog for minutes at a time. Serve it from Redis while fresh,
+# and keep it much longer so discovery can fall back to the last known result during outages.
+TRENDING_CACHE_KEY = "trending:fakestore:v1"
+TRENDING_CACHE_TTL = 300 if settings.ENVIRONMENT == "production" else 30
+TRENDING_STALE_TTL = 86400
+TRENDING_PRODUCT_LIMIT = 10
+
+DISCOVERY_BATCH_SIZE = 25
+_PRODUCT_CREATE_LIST = TypeAdapter(List[ProductCreate])
 
 
 def get_product_by_id(db: Session, product_id: int) -> Optional[Product]:
     try:
-        return db.query(Product).filter(Product.id == product_id).first()
+        return db.get(Product, product_id)
     except Exception as e:
         logger.error(f"Error retrieving product with ID {product_id}: {e}", exc_info=True)
         return None
@@ -22,7 +40,10 @@ def get_product_by_id(db: Session, product_id: int) -> Optional[Product]:
 
 def get_products(db: Session, skip: int = 0, limit: int = 100) -> List[Product]:
     try:
-        return db.query(Product).offset(skip).limit(limit).all()
+        # lambda_stmt caches the compiled SQL; skip/limit are tracked as bound parameters
+        stmt = lambda_stmt(lambda: select(Product))
+        stmt += lambda s: s.offset(skip).limit(limit)
+        return list(db.execute(stmt).scalars().all())
     except Exception as e:
         logger.error(f"Error retrieving products: {e}", exc_info=True)
         return []
@@ -30,7 +51,7 @@ def get_products(db: Session, skip: int = 0, limit: int = 100) -> List[Product]:
 
 def create_product(db: Session, product: ProductCreate) -> Product:
     try:
-        db_product = Product(**product.dict())
+        db_product = Product(**product.model_dump())
         db.add(db_product)
         db.commit()
         db.refresh(db_product)
@@ -46,7 +67,7 @@ def update_product(db: Session, product_id: int, product: ProductUpdate) -> Opti
     try:
         db_product = get_product_by_id(db, product_id)
         if db_product:
-            update_data = product.dict(exclude_unset=True)
+            update_data = product.model_dump(exclude_unset=True)
             for key, value in update_data.items():
                 setattr(db_product, key, value)
             db.commit()
@@ -81,19 +102,21 @@ async def discover_trending_products_from_api() -> List[Dict[str, Any]]:
     """
     trending_products = []
     
+    cached = await cache_get_json(TRENDING_CACHE_KEY)
+    if cached and time.time() - cached["fetched_at"] < TRENDING_CACHE_TTL:
+        logger.debug("Using cached trending products")
+        return cached["products"]
+    
     try:
         logger.info("Starting product discovery from external APIs")
-        async with httpx.AsyncClient() as client:
-            # Get all products from FakeStoreAPI
-            logger.debug("Fetching products from FakeStoreAPI")
-            response = await client.get("https://fakestoreapi.com/products")
+        client = get_http_client()
+        # Ask FakeStoreAPI for only the products we use, and parse them as they stream in
+        logger.debug("Fetching products from FakeStoreAPI")
+        async with client.stream(
+            "GET", "https://fakestoreapi.com/products", params={"limit": TRENDING_PRODUCT_LIMIT}
+        ) as response:
             response.raise_for_status()
-            products_data = response.json()
-            
-            logger.info(f"Retrieved {len(products_data)} products from FakeStoreAPI")
-            
-            # Process products and mark them as trending
-            for product in products_data:
+            async for product in iter_json_items(response.aiter_bytes(), "item"):
                 # Convert price to string format
                 price_str = f"${product.get('price', 0)}"
                 
@@ -107,60 +130,147 @@ async def discover_trending_products_from_api() -> List[Dict[str, Any]]:
                 }
                 trending_products.append(trending_product)
                 
-                # Limit to 10 products for demo purposes
-                if len(trending_products) >= 10:
+                # The limit param is advisory; stop reading once we have enough
+                if len(trending_products) >= TRENDING_PRODUCT_LIMIT:
                     break
-            
-            logger.info(f"Processed {len(trending_products)} trending products")
+        
+        logger.info(f"Processed {len(trending_products)} trending products")
     except httpx.HTTPError as e:
         logger.error(f"HTTP error occurred while fetching products: {e}", exc_info=True)
-        return []
+        return _stale_trending_products(cached)
     except Exception as e:
         logger.error(f"Error discovering products: {e}", exc_info=True)
-        return []
+        return _stale_trending_products(cached)
     
+    await cache_set_json(
+        TRENDING_CACHE_KEY,
+        {"fetched_at": time.time(), "products": trending_products},
+        TRENDING_STALE_TTL
+    )
     return trending_products
 
 
-def discover_trending_products(db: Session) -> List[Product]:
+def _stale_trending_products(cached: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Discover trending products and save them to the database
+    Fall back to the last known discovery result when the upstream API fails
+    """
+    if not cached:
+        return []
+    logger.warning("Serving stale cached trending products after upstream failure")
+    return cached["products"]
+
+
+def _validate_discovered_batch(batch: List[Dict[str, Any]]) -> List[Optional[ProductCreate]]:
+    """
+    Validate a batch of discovered products in one pass, leaving None in place of invalid ones
     """
-    # Use asyncio to run the async function synchronously
-    import asyncio
-    
     try:
-        logger.info("Starting trending product discovery")
-        # Run the async function
-        trending_products = asyncio.run(discover_trending_products_from_api())
-        logger.info(f"Discovered {len(trending_products)} trending products from APIs")
-    except Exception as e:
-        logger.error(f"Error running async product discovery: {e}", exc_info=True)
-        trending_products = []
-    
-    created_products = []
+        return _PRODUCT_CREATE_LIST.validate_python(batch)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors()}
+        logger.error(f"Skipping {len(invalid)} invalid discovered products: {e}")
+        return [
+            None if index in invalid else ProductCreate.model_validate(product_data)
+            for index, product_data in enumerate(batch)
+        ]
+
+
+def _stage_discovered_batch(
+    db: Session,
+    batch: List[Dict[str, Any]],
+    seen_urls: set,
+    staged: List[Union[Product, int]],
+    trending_ids: List[int]
+) -> List[Product]:
+    """
+    Sort one batch of discovered products into new rows and already-known product IDs,
+    returning the new rows to insert
+    """
+    # Look up the batch's already-known products in one query, fetching only the columns needed
+    urls = [product_data["url"] for product_data in batch]
+    existing_id_by_url = dict(
+        db.execute(select(Product.url, Product.id).where(Product.url.in_(urls))).tuples().all()
+    )
     
-    for product_data in trending_products:
+    new_products = []
+    for product_data, product_create in zip(batch, _validate_discovered_batch(batch)):
+        if product_create is None:
+            continue
         try:
+            # Skip repeated URLs within the same discovery run
+            if product_data["url"] in seen_urls:
+                continue
+            seen_urls.add(product_data["url"])
+            
             # Check if product already exists
-            existing_product = db.query(Product).filter(Product.url == product_data["url"]).first()
+            existing_id = existing_id_by_url.get(product_data["url"])
             
-            if not existing_product:
-                # Create new product
-                product_create = ProductCreate(**product_data)
-                created_product = create_product(db, product_create)
-                created_products.append(created_product)
+            if existing_id is None:
+                # Queue new product for the batch insert
+                new_product = Product(**product_create.model_dump())
+                new_products.append(new_product)
+                staged.append(new_product)
             else:
-                # Update existing product if it's trending
-                update_data = ProductUpdate(is_trending=True)
-                # Get the product ID and convert to int to satisfy type checker
-                product_id = int(str(existing_product.id))
-                updated_product = update_product(db, product_id, update_data)
-                if updated_product:
-                    created_products.append(updated_product)
+                # Mark existing product as trending in the bulk update
+                trending_ids.append(existing_id)
+                staged.append(existing_id)
         except Exception as e:
             logger.error(f"Error processing product {product_data.get('name', 'Unknown')}: {e}", exc_info=True)
             continue
+    return new_products
+
+
+async def discover_trending_products(db: Session) -> List[Product]:
+    """
+    Discover trending products and save them to the database
+    """
+    try:
+        logger.info("Starting trending product discovery")
+        trending_products = await discover_trending_products_from_api()
+        logger.info(f"Discovered {len(trending_products)} trending products from APIs")
+    except Exception as e:
+        logger.error(f"Error running async product discovery: {e}", exc_info=True)
+        trending_products = []
+    
+    # The session is synchronous; keep its blocking I/O off the event loop
+    return await asyncio.to_thread(save_discovered_products, db, trending_products)
+
+
+def save_discovered_products(db: Session, trending_products: List[Dict[str, Any]]) -> List[Product]:
+    """
+    Insert new discovered products and mark known ones as trending in one transaction
+    """
+    staged: List[Union[Product, int]] = []
+    new_count = 0
+    trending_ids = []
+    seen_urls = set()
+    
+    try:
+        # Check and insert in fixed-size batches so the IN list and each flush stay small
+        # however many products the discovery sources return
+        for start in range(0, len(trending_products), DISCOVERY_BATCH_SIZE):
+            batch = trending_products[start:start + DISCOVERY_BATCH_SIZE]
+            new_products = _stage_discovered_batch(db, batch, seen_urls, staged, trending_ids)
+            db.add_all(new_products)
+            db.flush()
+            new_count += len(new_products)
+        
+        product_ids = [entry if isinstance(entry, int) else entry.id for entry in staged]
+        if trending_ids:
+            db.execute(update(Product).where(Product.id.in_(trending_ids)).values(is_trending=True))
+        db.commit()
+        logger.info(f"Created {new_count} new products and marked {len(trending_ids)} existing products as trending")
+        
+        # Load every discovered product in one query, in discovery order
+        products_by_id = {
+            product.id: product
+            for product in db.query(Product).filter(Product.id.in_(product_ids)).all()
+        } if product_ids else {}
+        created_products = [products_by_id[product_id] for product_id in product_ids]
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error saving discovered products: {e}", exc_info=True)
+        return []
     
     logger.info(f"Successfully processed {len(created_products)} products")
     return created_products
@@ -188,7 +298,13 @@ def analyze_product_trend_score(product: Product) -> float:
         base_score += 30.0
         
     # Add some randomness for demonstration
-    import random
     base_score += random.uniform(0, 20)
     
     return min(base_score, 100.0)
+
+
+def analyze_product_trend_scores(products: List[Product]) -> List[float]:
+    """
+    Score a batch of products in one pass, in the same order as ``products``
+    """
+    return [analyze_product_trend_score(product) for product in products]
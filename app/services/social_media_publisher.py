@@ -3,24 +3,88 @@ Social media publisher service for the AI Content Factory application
 """
 import httpx
 import asyncio
-from typing import List, Optional, Dict, Any
+import random
+import time
+import weakref
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
+from app.core.cache import cache_get_json, cache_set_json
 from app.core.config import settings
+from app.core.http_client import get_graph_api_client
+from app.core.logging import logger
 from app.models.social_media import SocialMediaPost
 from app.schemas.social_media import SocialMediaPostCreate, SocialMediaPostUpdate
 
+# Caps outbound publish calls across every batch running on a loop, to stay under platform rate limits
+MAX_CONCURRENT_PUBLISHES = 20
+PUBLISH_RETRY_ATTEMPTS = 3
+# A 429 or a failed connect means the platform never acted on the request, so any call can retry it;
+# server errors and read failures may follow a request that took effect, so only idempotent calls retry those
+RETRYABLE_STATUS_CODES = frozenset({429})
+IDEMPOTENT_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Post analytics change slowly; keep them fresh for 10 minutes and as a fallback for a day
+ANALYTICS_CACHE_TTL = 600
+ANALYTICS_STALE_TTL = 86400
+
+# asyncio.Semaphore binds to the loop it first waits on, so keep one per loop (API server, each Celery worker)
+_publish_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _publish_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _publish_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _publish_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_PUBLISHES)
+    return semaphore
+
+
+def _is_retryable(error: httpx.HTTPError, idempotent: bool = False) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        codes = IDEMPOTENT_RETRYABLE_STATUS_CODES if idempotent else RETRYABLE_STATUS_CODES
+        return error.response.status_code in codes
+    if idempotent:
+        return isinstance(error, httpx.TransportError)
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+
+async def _with_retry(
+    coro_fn: Callable[..., Awaitable[httpx.Response]], *args: Any,
+    attempts: int = PUBLISH_RETRY_ATTEMPTS, idempotent: bool = False, **kwargs: Any
+) -> httpx.Response:
+    """
+    Send a platform API request under the publish concurrency cap, retrying rate limits and
+    failed connects with exponential backoff; pass idempotent=True to also retry server errors
+    and dropped responses for calls that are safe to repeat
+    """
+    for attempt in range(attempts):
+        try:
+            async with _publish_semaphore():
+                response = await coro_fn(*args, **kwargs)
+                response.raise_for_status()
+                return response
+        except httpx.HTTPError as e:
+            if attempt == attempts - 1 or not _is_retryable(e, idempotent):
+                raise
+        # Back off outside the semaphore so waiting retries don't hold slots
+        await asyncio.sleep(2 ** attempt + random.random())
+
 
 def get_post_by_id(db: Session, post_id: int) -> Optional[SocialMediaPost]:
-    return db.query(SocialMediaPost).filter(SocialMediaPost.id == post_id).first()
+    return db.get(SocialMediaPost, post_id)
 
 
 def get_posts(db: Session, skip: int = 0, limit: int = 100) -> List[SocialMediaPost]:
-    return db.query(SocialMediaPost).offset(skip).limit(limit).all()
+    stmt = lambda_stmt(lambda: select(SocialMediaPost))
+    stmt += lambda s: s.offset(skip).limit(limit)
+    return list(db.execute(stmt).scalars().all())
 
 
 def create_post(db: Session, post: SocialMediaPostCreate) -> SocialMediaPost:
-    db_post = SocialMediaPost(**post.dict())
+    db_post = SocialMediaPost(**post.model_dump())
     db.add(db_post)
     db.commit()
     db.refresh(db_post)
@@ -30,7 +94,7 @@ def create_post(db: Session, post: SocialMediaPostCreate) -> SocialMediaPost:
 def update_post(db: Session, post_id: int, post: SocialMediaPostUpdate) -> Optional[SocialMediaPost]:
     db_post = get_post_by_id(db, post_id)
     if db_post:
-        update_data = post.dict(exclude_unset=True)
+        update_data = post.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_post, key, value)
         db.commit()
@@ -52,38 +116,38 @@ async def publish_to_tiktok(video_url: str, caption: str) -> Dict[str, Any]:
     Publish a video to TikTok using TikTok Business API
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # First, upload the video
-            # Note: TikTok requires uploading the actual video file content
-            # This is a simplified example - in practice, you'd need to download
-            # the video file and upload it as multipart form data
-            
-            # For demonstration, we'll simulate the process
-            # In a real implementation, you would:
-            # 1. Download the video file from video_url
-            # 2. Upload it to TikTok using their upload endpoint
-            # 3. Create the post with the uploaded video ID
-            
-            # Simulate API call delay
+        # First, upload the video
+        # Note: TikTok requires uploading the actual video file content
+        # This is a simplified example - in practice, you'd need to download
+        # the video file and upload it as multipart form data
+        
+        # For demonstration, we'll simulate the process
+        # In a real implementation, you would:
+        # 1. Download the video file from video_url
+        # 2. Upload it to TikTok using their upload endpoint
+        # 3. Create the post with the uploaded video ID
+        
+        # Simulate API call delay
+        async with _publish_semaphore():
             await asyncio.sleep(1)
-            
-            # Return simulated success response
-            return {
-                "platform": "tiktok",
-                "status": "published",
-                "post_id": "tiktok_123456789",
-                "post_url": "https://www.tiktok.com/@user/video/123456789"
-            }
+        
+        # Return simulated success response
+        return {
+            "platform": "tiktok",
+            "status": "published",
+            "post_id": "tiktok_123456789",
+            "post_url": "https://www.tiktok.com/@user/video/123456789"
+        }
         
     except httpx.HTTPError as e:
-        print(f"HTTP error occurred while publishing to TikTok: {e}")
+        logger.error(f"HTTP error occurred while publishing to TikTok: {e}", exc_info=True)
         return {
             "platform": "tiktok",
             "status": "failed",
             "error": f"HTTP error: {str(e)}"
         }
     except Exception as e:
-        print(f"Error publishing to TikTok: {e}")
+        logger.error(f"Error publishing to TikTok: {e}", exc_info=True)
         return {
             "platform": "tiktok",
             "status": "failed",
@@ -96,51 +160,53 @@ async def publish_to_instagram(video_url: str, caption: str) -> Dict[str, Any]:
     Publish a video to Instagram using Instagram Graph API
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # First, create a media object
-            # Note: Instagram requires the page ID to be set in settings
-            if not settings.INSTAGRAM_PAGE_ID:
-                raise ValueError("INSTAGRAM_PAGE_ID is not set in environment variables")
-            
-            media_response = await client.post(
-                f"https://graph.facebook.com/v18.0/{settings.INSTAGRAM_PAGE_ID}/media",
-                params={
-                    "access_token": settings.INSTAGRAM_CLIENT_SECRET,  # Using client secret as access token
-                    "video_url": video_url,
-                    "caption": caption,
-                    "media_type": "VIDEO"
-                }
-            )
-            media_response.raise_for_status()
-            media_data = media_response.json()
-            
-            # Then, publish the media
-            publish_response = await client.post(
-                f"https://graph.facebook.com/v18.0/{settings.INSTAGRAM_PAGE_ID}/media_publish",
-                params={
-                    "access_token": settings.INSTAGRAM_CLIENT_SECRET,
-                    "creation_id": media_data["id"]
-                }
-            )
-            publish_response.raise_for_status()
-            result = publish_response.json()
-            
-            return {
-                "platform": "instagram",
-                "status": "published",
-                "post_id": result.get("id"),
-                "post_url": f"https://www.instagram.com/p/{result.get('id')}/"
+        # First, create a media object
+        # Note: Instagram requires the page ID to be set in settings
+        if not settings.INSTAGRAM_PAGE_ID:
+            raise ValueError("INSTAGRAM_PAGE_ID is not set in environment variables")
+        
+        client = get_graph_api_client()
+        media_response = await _with_retry(
+            client.post,
+            f"/{settings.INSTAGRAM_PAGE_ID}/media",
+            params={
+                "access_token": settings.INSTAGRAM_CLIENT_SECRET,  # Using client secret as access token
+                "video_url": video_url,
+                "caption": caption,
+                "media_type": "VIDEO"
+            },
+            # A duplicate container is never published, so creating one again is harmless
+            idempotent=True
+        )
+        media_data = media_response.json()
+        
+        # Then, publish the media; not idempotent, since a repeat after a lost response posts twice
+        publish_response = await _with_retry(
+            client.post,
+            f"/{settings.INSTAGRAM_PAGE_ID}/media_publish",
+            params={
+                "access_token": settings.INSTAGRAM_CLIENT_SECRET,
+                "creation_id": media_data["id"]
             }
+        )
+        result = publish_response.json()
+        
+        return {
+            "platform": "instagram",
+            "status": "published",
+            "post_id": result.get("id"),
+            "post_url": f"https://www.instagram.com/p/{result.get('id')}/"
+        }
         
     except httpx.HTTPError as e:
-        print(f"HTTP error occurred while publishing to Instagram: {e}")
+        logger.error(f"HTTP error occurred while publishing to Instagram: {e}", exc_info=True)
         return {
             "platform": "instagram",
             "status": "failed",
             "error": f"HTTP error: {str(e)}"
         }
     except Exception as e:
-        print(f"Error publishing to Instagram: {e}")
+        logger.error(f"Error publishing to Instagram: {e}", exc_info=True)
         return {
             "platform": "instagram",
             "status": "failed",
@@ -153,35 +219,35 @@ async def publish_to_youtube(video_url: str, title: str, description: str) -> Di
     Publish a video to YouTube using YouTube Data API
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # For YouTube, we would typically need to:
-            # 1. Use OAuth 2.0 for authentication
-            # 2. Upload the video file (which requires downloading it first)
-            # 3. Set metadata like title, description, tags, etc.
-            
-            # This is a simplified example - in practice, you'd need to implement
-            # the full OAuth flow and video upload process
-            
-            # Simulate API call delay
+        # For YouTube, we would typically need to:
+        # 1. Use OAuth 2.0 for authentication
+        # 2. Upload the video file (which requires downloading it first)
+        # 3. Set metadata like title, description, tags, etc.
+        
+        # This is a simplified example - in practice, you'd need to implement
+        # the full OAuth flow and video upload process
+        
+        # Simulate API call delay
+        async with _publish_semaphore():
             await asyncio.sleep(1)
-            
-            # Return simulated success response
-            return {
-                "platform": "youtube",
-                "status": "published",
-                "video_id": "youtube_ABC123",
-                "post_url": "https://www.youtube.com/watch?v=ABC123"
-            }
+        
+        # Return simulated success response
+        return {
+            "platform": "youtube",
+            "status": "published",
+            "video_id": "youtube_ABC123",
+            "post_url": "https://www.youtube.com/watch?v=ABC123"
+        }
         
     except httpx.HTTPError as e:
-        print(f"HTTP error occurred while publishing to YouTube: {e}")
+        logger.error(f"HTTP error occurred while publishing to YouTube: {e}", exc_info=True)
         return {
             "platform": "youtube",
             "status": "failed",
             "error": f"HTTP error: {str(e)}"
         }
     except Exception as e:
-        print(f"Error publishing to YouTube: {e}")
+        logger.error(f"Error publishing to YouTube: {e}", exc_info=True)
         return {
             "platform": "youtube",
             "status": "failed",
@@ -223,7 +289,6 @@ def schedule_post(db: Session, platform: str, content: str, scheduled_time: str)
     Schedule a social media post for future publication
     """
     # Convert string to datetime if needed
-    from datetime import datetime
     try:
         if isinstance(scheduled_time, str):
             scheduled_datetime = datetime.fromisoformat(scheduled_time)
@@ -246,7 +311,28 @@ def schedule_post(db: Session, platform: str, content: str, scheduled_time: str)
 async def get_social_media_analytics(post_id: str, platform: str) -> Dict[str, Any]:
     """
     Get analytics for a published social media post
+
+    Results are cached per post; if the platform API fails, the last cached
+    analytics are returned with ``"stale": True`` instead of an error.
     """
+    cache_key = f"analytics:{platform}:{post_id}"
+    cached = await cache_get_json(cache_key)
+    if cached and time.time() - cached["fetched_at"] < ANALYTICS_CACHE_TTL:
+        return cached["analytics"]
+    
+    try:
+        analytics = await _fetch_social_media_analytics(post_id, platform)
+    except Exception as e:
+        if not cached:
+            raise
+        logger.warning(f"Serving stale {platform} analytics for post {post_id} after error: {e}")
+        return {**cached["analytics"], "stale": True}
+    
+    await cache_set_json(cache_key, {"fetched_at": time.time(), "analytics": analytics}, ANALYTICS_STALE_TTL)
+    return analytics
+
+
+async def _fetch_social_media_analytics(post_id: str, platform: str) -> Dict[str, Any]:
     # In a real implementation, this would call platform-specific analytics APIs
     
     # For demonstration, return sample analytics data
@@ -260,4 +346,4 @@ async def get_social_media_analytics(post_id: str, platform: str) -> Dict[str, A
         "shares": 320,
         "comments": 180,
         "engagement_rate": 16.4
-    }
\ No newline at end of file
+    }
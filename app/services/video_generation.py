@@ -2,27 +2,75 @@
 Video generation service for the AI Content Factory application
 """
 import asyncio
+import json
 import httpx
-from typing import List, Optional, Dict, Any
+from string import Template
+from typing import List, Optional, Dict, Any, cast
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.http_client import get_concurrent_http_client
+from app.core.logging import logger
 from app.models.video import Video
 from app.models.product import Product
 from app.schemas.video import VideoCreate, VideoUpdate
 from app.services.product_discovery import get_product_by_id
 
 
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# Parsed once at import; generate_video_script only interpolates product fields into them
+SCRIPT_PROMPT_TEMPLATE = Template("""
+    Create a short, engaging video script for a product with these details:
+    Product Name: $name
+    Description: $description
+    Price: $price
+    
+    The script should be structured with:
+    1. An attention-grabbing opening
+    2. Product introduction and key features
+    3. Benefits and value proposition
+    4. Clear call-to-action
+    5. Closing
+    
+    Keep it concise and engaging for social media. Format it with scene descriptions in brackets.
+    """)
+
+FALLBACK_SCRIPT_TEMPLATE = Template("""
+    [Opening Scene]
+    Hey everyone! Today I'm excited to show you $name.
+    
+    [Product Introduction]
+    $description
+    This amazing product is priced at just $price.
+    
+    [Key Features]
+    Here are the key features that make this product stand out:
+    1. High quality construction
+    2. Easy to use
+    3. Great value for money
+    
+    [Call to Action]
+    If you're interested in $name, check out the link in the description!
+    
+    [Closing]
+    Thanks for watching, and don't forget to like and subscribe for more great products!
+    """.strip())
+
+
 def get_video_by_id(db: Session, video_id: int) -> Optional[Video]:
-    return db.query(Video).filter(Video.id == video_id).first()
+    return db.get(Video, video_id)
 
 
 def get_videos(db: Session, skip: int = 0, limit: int = 100) -> List[Video]:
-    return db.query(Video).offset(skip).limit(limit).all()
+    stmt = lambda_stmt(lambda: select(Video))
+    stmt += lambda s: s.offset(skip).limit(limit)
+    return list(db.execute(stmt).scalars().all())
 
 
 def create_video(db: Session, video: VideoCreate) -> Video:
-    db_video = Video(**video.dict())
+    db_video = Video(**video.model_dump())
     db.add(db_video)
     db.commit()
     db.refresh(db_video)
@@ -32,7 +80,7 @@ def create_video(db: Session, video: VideoCreate) -> Video:
 def update_video(db: Session, video_id: int, video: VideoUpdate) -> Optional[Video]:
     db_video = get_video_by_id(db, video_id)
     if db_video:
-        update_data = video.dict(exclude_unset=True)
+        update_data = video.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_video, key, value)
         db.commit()
@@ -49,98 +97,74 @@ def delete_video(db: Session, video_id: int) -> bool:
     return False
 
 
-def generate_video_script(product_id: int, db: Session) -> str:
+async def generate_video_script(product: Product) -> str:
     """
     Generate a video script for a product using AI
     """
-    # Get the product details
-    product = get_product_by_id(db, product_id)
-    if not product:
-        return "Product not found"
-    
-    # Create a prompt for the AI to generate a script
-    prompt = f"""
-    Create a short, engaging video script for a product with these details:
-    Product Name: {product.name}
-    Description: {product.description}
-    Price: {product.price}
-    
-    The script should be structured with:
-    1. An attention-grabbing opening
-    2. Product introduction and key features
-    3. Benefits and value proposition
-    4. Clear call-to-action
-    5. Closing
-    
-    Keep it concise and engaging for social media. Format it with scene descriptions in brackets.
-    """
+    fields = {"name": product.name, "description": product.description, "price": product.price}
     
     # Try to use real AI service if API key is configured
-    from app.core.config import settings
     if settings.OPENAI_API_KEY and settings.OPENAI_API_KEY != "your_openai_api_key_here":
         try:
-            import asyncio
-            return asyncio.run(call_ai_script_generation_api(prompt))
+            # Create a prompt for the AI to generate a script
+            prompt = SCRIPT_PROMPT_TEMPLATE.substitute(fields)
+            return await call_ai_script_generation_api(prompt)
         except Exception as e:
-            print(f"AI API failed, falling back to template: {e}")
+            logger.warning(f"AI API failed, falling back to template: {e}")
             # Fall back to template if API fails
     
     # Template-based script for development or fallback
-    script_template = f"""
-    [Opening Scene]
-    Hey everyone! Today I'm excited to show you {product.name}.
-    
-    [Product Introduction]
-    {product.description}
-    This amazing product is priced at just {product.price}.
-    
-    [Key Features]
-    Here are the key features that make this product stand out:
-    1. High quality construction
-    2. Easy to use
-    3. Great value for money
-    
-    [Call to Action]
-    If you're interested in {product.name}, check out the link in the description!
-    
-    [Closing]
-    Thanks for watching, and don't forget to like and subscribe for more great products!
-    """
-    
-    return script_template.strip()
+    return FALLBACK_SCRIPT_TEMPLATE.substitute(fields)
 
 
-async def call_ai_script_generation_api(prompt: str) -> str:
+async def call_ai_script_generation_api(prompt: str, probe: bool = False) -> str:
     """
     Call an external AI API to generate a video script
     Using OpenAI GPT-3.5-turbo as an example
+
+    With ``probe=True`` this is a liveness check: the completion is streamed, capped at a
+    few tokens and the first piece of content is returned as soon as it arrives.
     """
+    headers = {
+        "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "model": "gpt-3.5-turbo",
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": 16 if probe else 500,
+        "temperature": 0.7
+    }
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-3.5-turbo",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 500,
-                    "temperature": 0.7
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"].strip()
+        client = get_concurrent_http_client()
+        if probe:
+            return await _first_streamed_content(client, headers, {**payload, "stream": True})
+        response = await client.post(OPENAI_CHAT_COMPLETIONS_URL, headers=headers, json=payload)
+        response.raise_for_status()
+        result = response.json()
+        return result["choices"][0]["message"]["content"].strip()
     except httpx.HTTPError as e:
-        print(f"HTTP error occurred while calling OpenAI API: {e}")
+        logger.error(f"HTTP error occurred while calling OpenAI API: {e}", exc_info=True)
         return "Error generating script. Please try again later."
     except Exception as e:
-        print(f"Error calling AI script generation API: {e}")
+        logger.error(f"Error calling AI script generation API: {e}", exc_info=True)
         return "Error generating script. Please try again later."
 
 
+async def _first_streamed_content(client: httpx.AsyncClient, headers: Dict[str, str], payload: Dict[str, Any]) -> str:
+    """Return the first non-empty content delta of a streamed chat completion"""
+    async with client.stream("POST", OPENAI_CHAT_COMPLETIONS_URL, headers=headers, json=payload) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            choices = json.loads(line[len("data: "):]).get("choices") or [{}]
+            content = choices[0].get("delta", {}).get("content")
+            if content:
+                return content
+    raise ValueError("OpenAI stream ended without any content")
+
+
 def clone_viral_video_format(template_video_id: int, db: Session) -> str:
     """
     Clone a viral video format to create a new video
@@ -177,9 +201,14 @@ async def generate_avatar_video(script: str, product_id: int) -> str:
     return f"https://example.com/videos/generated_video_for_product_{product_id}.mp4"
 
 
-def create_video_for_product(product_id: int, db: Session) -> Optional[Video]:
+async def create_video_for_product(
+    product_id: int, db: Session, video_url: Optional[str] = None, script: Optional[str] = None
+) -> Optional[Video]:
     """
     Create a complete video for a product, including script generation and video creation
+
+    Callers that have already rendered the avatar video pass its ``video_url`` (and the
+    ``script`` it was rendered from) so it is only recorded, not rendered a second time
     """
     # Get the product
     product = get_product_by_id(db, product_id)
@@ -187,7 +216,21 @@ def create_video_for_product(product_id: int, db: Session) -> Optional[Video]:
         return None
     
     # Generate script
-    script = generate_video_script(product_id, db)
+    if script is None:
+        script = await generate_video_script(product)
+    
+    if video_url is not None:
+        return await asyncio.to_thread(create_video, db, VideoCreate(
+            title=f"How to use {product.name}",
+            description=f"Learn how to use {product.name} with this helpful video guide",
+            script=script,
+            video_url=video_url,
+            status="completed",
+            product_id=product_id
+        ))
+    
+    # Start rendering while the video record is written
+    video_task = asyncio.create_task(generate_avatar_video(script, product_id))
     
     # Create video record
     video_create = VideoCreate(
@@ -198,18 +241,20 @@ def create_video_for_product(product_id: int, db: Session) -> Optional[Video]:
         product_id=product_id
     )
     
-    video = create_video(db, video_create)
+    try:
+        video = await asyncio.to_thread(create_video, db, video_create)
+    except Exception:
+        video_task.cancel()
+        raise
     
-    # In a real implementation, we would:
-    # 1. Call the AI avatar service to generate the video
-    # 2. Update the video record with the generated video URL
-    # 3. Update the status to "completed"
+    try:
+        video_url = await video_task
+    except Exception as e:
+        logger.error(f"Avatar video generation failed for product {product_id}: {e}", exc_info=True)
+        return await asyncio.to_thread(update_video, db, cast(int, video.id), VideoUpdate(status="failed"))
     
-    # For now, we'll simulate the completion
     update_data = VideoUpdate(
-        video_url=f"https://example.com/videos/product_{product_id}_video.mp4",
+        video_url=video_url,
         status="completed"
     )
-    update_video(db, int(str(video.id)), update_data)
-    
-    return get_video_by_id(db, int(str(video.id)))
\ No newline at end of file
+    return await asyncio.to_thread(update_video, db, cast(int, video.id), update_data)
@@ -5,14 +5,18 @@ Handles YouTube authentication and video uploads using OAuth2
 import os
 import json
 import pickle
+import time
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaInMemoryUpload
 from googleapiclient.errors import HttpError
 
 from app.core.config import settings
@@ -25,7 +29,27 @@ SCOPES = ['https://www.googleapis.com/auth/youtube.upload',
           'https://www.googleapis.com/auth/youtube.force-ssl']
 
 # Token storage path
-TOKEN_FILE = 'youtube_token.pickle'
+TOKEN_FILE = 'youtube_token.json'
+# Pickled token written by earlier versions; migrated to TOKEN_FILE on first load
+LEGACY_TOKEN_FILE = 'youtube_token.pickle'
+
+# OAuth callback used when a caller doesn't pass its own redirect URI
+_BASE_URL = os.getenv('APP_BASE_URL', 'http://localhost:8000')
+_REDIRECT_URI = f"{_BASE_URL}/api/v1/social-media/youtube/oauth2callback"
+
+# Socket timeout (seconds) for YouTube API and upload requests
+HTTP_TIMEOUT = 120
+
+# Retries (with exponential backoff) for each resumable upload request on 5xx, 429 and connection
+# errors. Only chunked uploads (files over YOUTUBE_SINGLE_REQUEST_UPLOAD_MAX_BYTES, sent in
+# YOUTUBE_UPLOAD_CHUNKSIZE pieces) lose at most the current chunk; single-request uploads send
+# the whole file again, but into the same upload session. In-memory uploads are not retried
+UPLOAD_NUM_RETRIES = 5
+
+# How long a successful is_authenticated() check is trusted, and how close to token
+# expiry it stops being trusted
+AUTH_CHECK_CACHE_SECONDS = 60
+AUTH_EXPIRY_MARGIN_SECONDS = 30
 
 
 class YouTubeOAuthService:
@@ -34,6 +58,9 @@ class YouTubeOAuthService:
     def __init__(self):
         self.credentials: Optional[Credentials] = None
         self.youtube_service = None
+        self._authed_http: Optional[AuthorizedHttp] = None
+        self._client_config: Optional[Dict[str, Any]] = None
+        self._valid_until = 0.0
         self._load_credentials()
     
     def _load_credentials(self) -> None:
@@ -42,38 +69,94 @@ class YouTubeOAuthService:
         
         if token_path.exists():
             try:
-                with open(token_path, 'rb') as token:
-                    self.credentials = pickle.load(token)
+                with open(token_path, 'r', encoding='utf-8') as token:
+                    self.credentials = Credentials.from_authorized_user_info(json.load(token), SCOPES)
                 logger.info("YouTube credentials loaded from token file")
             except Exception as e:
                 logger.warning(f"Failed to load YouTube credentials: {e}")
                 self.credentials = None
+        elif Path(LEGACY_TOKEN_FILE).exists():
+            self._migrate_legacy_token()
+    
+    def _migrate_legacy_token(self) -> None:
+        """Convert a pickled token from an earlier version to JSON storage"""
+        legacy_path = Path(LEGACY_TOKEN_FILE)
+        try:
+            with open(legacy_path, 'rb') as token:
+                self.credentials = pickle.load(token)
+        except Exception as e:
+            logger.warning(f"Failed to load legacy YouTube credentials: {e}")
+            self.credentials = None
+            return
+        
+        self._save_credentials()
+        if Path(TOKEN_FILE).exists():
+            legacy_path.unlink()
+            logger.info(f"Migrated YouTube credentials from {LEGACY_TOKEN_FILE} to {TOKEN_FILE}")
     
     def _save_credentials(self) -> None:
         """Save credentials to token file"""
+        # Write a sibling temp file and rename it over the token so a crash mid-write
+        # never leaves a truncated token behind
+        tmp_file = TOKEN_FILE + '.tmp'
         try:
-            with open(TOKEN_FILE, 'wb') as token:
-                pickle.dump(self.credentials, token)
+            data = self.credentials.to_json().encode('utf-8')
+            with open(tmp_file, 'wb') as token:
+                token.write(data)
+            os.replace(tmp_file, TOKEN_FILE)
             logger.info("YouTube credentials saved to token file")
         except Exception as e:
             logger.error(f"Failed to save YouTube credentials: {e}")
     
+    def _get_client_config(self) -> Dict[str, Any]:
+        """Load the OAuth client secrets file on first use and keep the parsed config"""
+        if self._client_config is None:
+            client_secret_file = settings.YOUTUBE_CLIENT_SECRET_FILE
+            
+            if not os.path.exists(client_secret_file):
+                raise FileNotFoundError(f"Client secret file not found: {client_secret_file}")
+            
+            with open(client_secret_file, 'r', encoding='utf-8') as secrets:
+                self._client_config = json.load(secrets)
+        
+        return self._client_config
+    
     def is_authenticated(self) -> bool:
         """Check if user is authenticated with YouTube"""
-        if not self.credentials:
+        credentials = self.credentials
+        if not credentials:
             return False
         
+        # Skip the expiry check while a recent successful check still holds
+        if time.monotonic() < self._valid_until:
+            return True
+        
         # Refresh token if expired
-        if self.credentials.expired and self.credentials.refresh_token:
+        if credentials.expired and credentials.refresh_token:
             try:
-                self.credentials.refresh(Request())
+                credentials.refresh(Request())
                 self._save_credentials()
                 logger.info("YouTube credentials refreshed")
             except Exception as e:
                 logger.error(f"Failed to refresh YouTube credentials: {e}")
+                self._valid_until = 0.0
                 return False
         
-        return self.credentials and self.credentials.valid
+        if not credentials.valid:
+            return False
+        
+        self._valid_until = time.monotonic() + self._auth_check_ttl()
+        return True
+    
+    def _auth_check_ttl(self) -> float:
+        """Seconds to trust a successful check: capped, and never past the token's expiry"""
+        expiry = self.credentials.expiry
+        if expiry is None:
+            return AUTH_CHECK_CACHE_SECONDS
+        
+        # google-auth keeps expiry as a naive UTC datetime
+        remaining = (expiry - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
+        return max(0.0, min(AUTH_CHECK_CACHE_SECONDS, remaining - AUTH_EXPIRY_MARGIN_SECONDS))
     
     def get_auth_url(self, redirect_uri: Optional[str] = None) -> str:
         """
@@ -85,19 +168,14 @@ class YouTubeOAuthService:
         Returns:
             Authorization URL for user to visit
         """
-        client_secret_file = settings.YOUTUBE_CLIENT_SECRET_FILE
-        
-        if not os.path.exists(client_secret_file):
-            raise FileNotFoundError(f"Client secret file not found: {client_secret_file}")
+        client_config = self._get_client_config()
         
         # Auto-detect redirect URI if not provided
         if not redirect_uri:
-            # Use environment variable or default to localhost
-            base_url = os.getenv('APP_BASE_URL', 'http://localhost:8000')
-            redirect_uri = f"{base_url}/api/v1/social-media/youtube/oauth2callback"
+            redirect_uri = _REDIRECT_URI
         
-        flow = Flow.from_client_secrets_file(
-            client_secret_file,
+        flow = Flow.from_client_config(
+            client_config,
             scopes=SCOPES,
             redirect_uri=redirect_uri
         )
@@ -122,23 +200,27 @@ class YouTubeOAuthService:
             True if authentication successful
         """
         try:
-            client_secret_file = settings.YOUTUBE_CLIENT_SECRET_FILE
+            client_config = self._get_client_config()
             
             # Auto-detect redirect URI if not provided
             if not redirect_uri:
-                base_url = os.getenv('APP_BASE_URL', 'http://localhost:8000')
-                redirect_uri = f"{base_url}/api/v1/social-media/youtube/oauth2callback"
+                redirect_uri = _REDIRECT_URI
             
-            flow = Flow.from_client_secrets_file(
-                client_secret_file,
+            flow = Flow.from_client_config(
+                client_config,
                 scopes=SCOPES,
                 redirect_uri=redirect_uri
             )
             
             flow.fetch_token(code=code)
             self.credentials = flow.credentials  # type: ignore
+            self._valid_until = 0.0
             self._save_credentials()
             
+            # Drop the service bound to the previous credentials
+            self.youtube_service = None
+            self._authed_http = None
+            
             logger.info("YouTube authentication successful")
             return True
             
@@ -157,7 +239,10 @@ class YouTubeOAuthService:
             raise ValueError("Not authenticated with YouTube. Please authenticate first.")
         
         if not self.youtube_service:
-            self.youtube_service = build('youtube', 'v3', credentials=self.credentials)
+            # One keep-alive transport for every API call and upload request; AuthorizedHttp
+            # refreshes the shared credentials in place, so it only needs rebuilding on re-auth
+            self._authed_http = AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+            self.youtube_service = build('youtube', 'v3', http=self._authed_http)
         
         return self.youtube_service
     
@@ -185,8 +270,10 @@ class YouTubeOAuthService:
             Upload response with video ID and URL
         """
         try:
-            if not os.path.exists(video_path):
-                raise FileNotFoundError(f"Video file not found: {video_path}")
+            try:
+                file_size = os.path.getsize(video_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Video file not found: {video_path}") from None
             
             youtube = self.get_youtube_service()
             
@@ -207,12 +294,24 @@ class YouTubeOAuthService:
                 body['snippet']['tags'] = tags
             
             # Create media upload
-            media = MediaFileUpload(
-                video_path,
-                mimetype='video/*',
-                resumable=True,
-                chunksize=1024*1024  # 1MB chunks
-            )
+            if file_size <= settings.YOUTUBE_IN_MEMORY_UPLOAD_MAX_BYTES:
+                # Small enough to skip the resumable session setup request entirely
+                with open(video_path, 'rb') as video_file:
+                    media = MediaInMemoryUpload(video_file.read(), mimetype='video/*', resumable=False)
+            else:
+                # Each chunk is a separate round trip, so send typical videos in one request
+                # and only fall back to (large) chunks for big files
+                if file_size <= settings.YOUTUBE_SINGLE_REQUEST_UPLOAD_MAX_BYTES:
+                    chunksize = -1
+                else:
+                    chunksize = settings.YOUTUBE_UPLOAD_CHUNKSIZE
+                
+                media = MediaFileUpload(
+                    video_path,
+                    mimetype='video/*',
+                    resumable=True,
+                    chunksize=chunksize
+                )
             
             # Execute upload
             request = youtube.videos().insert(
@@ -221,11 +320,16 @@ class YouTubeOAuthService:
                 media_body=media
             )
             
-            response = None
-            while response is None:
-                status, response = request.next_chunk()
-                if status:
-                    logger.info(f"Upload progress: {int(status.progress() * 100)}%")
+            if media.resumable():
+                response = None
+                while response is None:
+                    status, response = request.next_chunk(num_retries=UPLOAD_NUM_RETRIES)
+                    if status:
+                        logger.info(f"Upload progress: {int(status.progress() * 100)}%")
+            else:
+                # A plain insert isn't idempotent: retrying after a lost response would publish a
+                # second copy of the video, so it is sent exactly once
+                response = request.execute()
             
             video_id = response['id']
             video_url = f"https://www.youtube.com/watch?v={video_id}"
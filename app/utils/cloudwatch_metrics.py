@@ -1,14 +1,29 @@
 """
 CloudWatch metrics utility for Content Factory
 """
+import atexit
 import boto3
 import logging
-from datetime import datetime
-from typing import Optional, List, Dict
-from botocore.exceptions import ClientError
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any, Deque, Optional, List, Dict
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 
 logger = logging.getLogger(__name__)
 
+# Metrics are buffered and sent in the background: every FLUSH_INTERVAL_SECONDS, or sooner
+# once FLUSH_THRESHOLD are waiting. PutMetricData accepts at most 1000 metrics per call.
+FLUSH_INTERVAL_SECONDS = 5.0
+FLUSH_THRESHOLD = 20
+MAX_METRICS_PER_REQUEST = 1000
+
+# Room in the HTTP pool for PutMetricData bursts; retry briefly rather than stall the flusher
+CLIENT_CONFIG = Config(max_pool_connections=50, retries={'max_attempts': 2})
+
 
 class CloudWatchMetrics:
     """Send custom metrics to CloudWatch"""
@@ -16,13 +31,35 @@ class CloudWatchMetrics:
     def __init__(self, namespace: str = "ContentFactory", region: str = "eu-west-3"):
         self.namespace = namespace
         self.region = region
-        try:
-            self.cloudwatch = boto3.client('cloudwatch', region_name=region)
-            self.enabled = True
-            logger.info(f"CloudWatch metrics initialized for namespace: {namespace}")
-        except Exception as e:
-            logger.warning(f"CloudWatch not available: {e}")
-            self.enabled = False
+        self.enabled = True
+        
+        self._client_lock = threading.Lock()
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        atexit.register(self.flush)
+    
+    @cached_property
+    def cloudwatch(self) -> Any:
+        """
+        boto3 CloudWatch client, created on first use so each forked worker resolves its
+        own endpoint and credentials instead of inheriting the parent's connections
+        
+        Returns:
+            The client, or None if CloudWatch is unavailable (metrics are then disabled)
+        """
+        with self._client_lock:
+            if 'cloudwatch' in self.__dict__:
+                return self.__dict__['cloudwatch']
+            try:
+                client = boto3.client('cloudwatch', region_name=self.region, config=CLIENT_CONFIG)
+                logger.info(f"CloudWatch metrics initialized for namespace: {self.namespace}")
+                return client
+            except Exception as e:
+                logger.warning(f"CloudWatch not available: {e}")
+                self.enabled = False
+                return None
     
     def put_metric(
         self,
@@ -32,7 +69,7 @@ class CloudWatchMetrics:
         dimensions: Optional[List[Dict[str, str]]] = None
     ) -> bool:
         """
-        Send a metric to CloudWatch
+        Queue a metric to be sent to CloudWatch with the next batch
         
         Args:
             metric_name: Name of the metric
@@ -41,32 +78,83 @@ class CloudWatchMetrics:
             dimensions: List of dimension dicts [{'Name': 'key', 'Value': 'val'}]
             
         Returns:
-            True if successful, False otherwise
+            True if the metric was queued, False if CloudWatch is disabled
         """
         if not self.enabled:
             return False
         
-        try:
-            metric_data = {
-                'MetricName': metric_name,
-                'Value': value,
-                'Unit': unit,
-                'Timestamp': datetime.utcnow()
-            }
-            
-            if dimensions:
-                metric_data['Dimensions'] = dimensions
-            
-            self.cloudwatch.put_metric_data(
-                Namespace=self.namespace,
-                MetricData=[metric_data]
-            )
-            
+        metric_data = {
+            'MetricName': metric_name,
+            'Value': value,
+            'Unit': unit,
+            # Whole seconds; converted to datetimes in flush, once per distinct second
+            'Timestamp': int(time.time())
+        }
+        
+        if dimensions:
+            metric_data['Dimensions'] = dimensions
+        
+        with self._lock:
+            self._buffer.append(metric_data)
+            pending = len(self._buffer)
+            # Threads don't survive fork, so a worker child starts its own flusher
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._run_flusher, name="cloudwatch-metrics", daemon=True)
+                self._flusher.start()
+        
+        if pending >= FLUSH_THRESHOLD:
+            self._flush_requested.set()
+        
+        return True
+    
+    def flush(self) -> bool:
+        """
+        Send all queued metrics now, in as few PutMetricData calls as possible
+        
+        Returns:
+            True if every batch was accepted, False otherwise
+        """
+        with self._lock:
+            metrics = list(self._buffer)
+            self._buffer.clear()
+        
+        if not metrics:
             return True
-            
-        except ClientError as e:
-            logger.error(f"Failed to send metric {metric_name}: {e}")
+        
+        client = self.cloudwatch
+        if client is None:
             return False
+        
+        timestamps: Dict[int, datetime] = {}
+        for metric in metrics:
+            second = metric['Timestamp']
+            if second not in timestamps:
+                timestamps[second] = datetime.fromtimestamp(second, tz=timezone.utc)
+            metric['Timestamp'] = timestamps[second]
+        
+        success = True
+        for start in range(0, len(metrics), MAX_METRICS_PER_REQUEST):
+            batch = metrics[start:start + MAX_METRICS_PER_REQUEST]
+            try:
+                client.put_metric_data(
+                    Namespace=self.namespace,
+                    MetricData=batch
+                )
+            except (BotoCoreError, ClientError) as e:
+                logger.error(f"Failed to send {len(batch)} metrics: {e}")
+                success = False
+        
+        return success
+    
+    def _run_flusher(self) -> None:
+        """Background loop that sends queued metrics until the process exits"""
+        while True:
+            self._flush_requested.wait(FLUSH_INTERVAL_SECONDS)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"CloudWatch metrics flush failed: {e}")
     
     def track_api_request(self, endpoint: str, status_code: int, response_time: float) -> None:
         """
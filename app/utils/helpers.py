@@ -1,15 +1,18 @@
 """
 Helper functions for the AI Content Factory application
 """
-import re
 from typing import Dict, Any
 from datetime import datetime
+from urllib.parse import urlsplit
+
+_INVALID_FILENAME_CHARS = '<>:"/\\|?*' + ''.join(chr(code) for code in range(0x20))
+_FILENAME_TRANSLATION = str.maketrans(_INVALID_FILENAME_CHARS, '_' * len(_INVALID_FILENAME_CHARS))
 
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize a filename by removing invalid characters"""
     # Remove invalid characters
-    sanitized = re.sub(r'[<>:"/\\|?*\x00-\x1F]', '_', filename)
+    sanitized = filename.translate(_FILENAME_TRANSLATION)
     # Limit length
     return sanitized[:255]
 
@@ -21,15 +24,14 @@ def format_timestamp(timestamp: datetime) -> str:
 
 def merge_dicts(dict1: Dict[Any, Any], dict2: Dict[Any, Any]) -> Dict[Any, Any]:
     """Merge two dictionaries, with dict2 values overriding dict1 values"""
-    result = dict1.copy()
-    result.update(dict2)
-    return result
+    return dict1 | dict2
 
 
 def extract_domain(url: str) -> str:
     """Extract the domain from a URL"""
-    # Simple regex to extract domain
-    match = re.search(r'https?://(?:www\.)?([^/]+)', url)
-    if match:
-        return match.group(1)
-    return url
\ No newline at end of file
+    try:
+        host = urlsplit(url).hostname or url
+    except ValueError:
+        # Malformed input (e.g. an unclosed IPv6 bracket) from scraped pages; hand it back as is
+        host = url
+    return host[4:] if host.startswith('www.') else host
\ No newline at end of file
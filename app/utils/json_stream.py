@@ -0,0 +1,31 @@
+"""
+Incremental JSON parsing helpers for the AI Content Factory application
+"""
+from typing import Any, AsyncIterable, AsyncIterator
+
+import ijson
+
+
+class _AsyncByteReader:
+    """Adapt an async iterable of byte chunks to the async file-like object ijson expects"""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str; don't consume a chunk for it
+        if size == 0:
+            return b""
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+async def iter_json_items(chunks: AsyncIterable[bytes], prefix: str) -> AsyncIterator[Any]:
+    """
+    Yield the JSON objects found under ``prefix`` (ijson path syntax, e.g.
+    ``"itemSummaries.item"``) without materializing the rest of the document
+    """
+    async for item in ijson.items_async(_AsyncByteReader(chunks), prefix, use_float=True):
+        yield item
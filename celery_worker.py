@@ -1,9 +1,27 @@
 """
 Celery worker configuration for the AI Content Factory application
 """
+import asyncio
+from typing import Any, Awaitable, Optional, TypeVar, cast
+
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import settings
+from app.core.database import session_scope
+from app.core.http_client import close_http_client
+from app.schemas.video import VideoUpdate
+from app.services.ai_avatar import create_avatar_video
+from app.services.content_workflow import create_content_for_product, execute_full_content_workflow
+from app.services.product_discovery import discover_trending_products, get_product_by_id
+from app.services.social_media_publisher import publish_to_instagram, publish_to_tiktok, publish_to_youtube
+from app.services.video_generation import (
+    create_video_for_product,
+    generate_video_script,
+    get_video_by_id,
+    update_video
+)
+from app.utils.cloudwatch_metrics import cloudwatch_metrics
 
 # Create the Celery app
 celery_app = Celery(
@@ -29,20 +47,49 @@ celery_app.conf.update(
 )
 
 
+T = TypeVar("T")
+
+# One event loop per worker process, reused by every task so pooled HTTP/Redis clients
+# (which are bound to a loop) survive between tasks
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion on this worker process's event loop
+    """
+    global _worker_loop
+    # Created lazily so pools without worker_process_init (solo, eager tests) work too
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs: Any) -> None:
+    # A forked child must not reuse a loop inherited from the parent process
+    global _worker_loop
+    _worker_loop = None
+    # Resolve the CloudWatch endpoint and credentials at startup rather than on the first task
+    cloudwatch_metrics.cloudwatch
+
+
+@worker_process_shutdown.connect
+def _close_worker_loop(**kwargs: Any) -> None:
+    if _worker_loop is not None and not _worker_loop.is_closed():
+        _worker_loop.run_until_complete(close_http_client())
+        _worker_loop.close()
+
 @celery_app.task
 def discover_products_task():
     """
     Celery task to discover trending products
     """
-    # Import here to avoid circular imports
-    from app.services.product_discovery import discover_trending_products
-    from app.core.database import SessionLocal
-    
     try:
-        db = SessionLocal()
-        products = discover_trending_products(db)
-        db.close()
-        return {"status": "success", "products_found": len(products), "products": [p.name for p in products]}
+        with session_scope() as db:
+            products = run_async(discover_trending_products(db))
+            return {"status": "success", "products_found": len(products), "products": [p.name for p in products]}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -52,59 +99,42 @@ def generate_video_task(product_id: int):
     """
     Celery task to generate a video for a product using AI avatar service
     """
-    # Import here to avoid circular imports
-    from app.services.video_generation import generate_video_script, create_video_for_product
-    from app.services.ai_avatar import create_avatar_video
-    from app.core.database import SessionLocal
-    
     try:
-        db = SessionLocal()
-        # Generate script
-        script = generate_video_script(product_id, db)
-        
-        # Create video using AI avatar
-        avatar_settings = {
-            "title": f"Product Demo Video {product_id}",
-            "description": "AI Generated Product Demo",
-            "ratio": "16:9",
-            "avatar_id": "default_avatar",
-            "voice_id": "default_voice",
-            "background": "default_background"
-        }
-        
-        # Create avatar video
-        import asyncio
-        video_url = asyncio.run(create_avatar_video(script, avatar_settings))
-        
-        # Save video to database
-        video = create_video_for_product(product_id, db)
-        
-        # Update video with the real URL
-        if video:
-            from app.services.video_generation import update_video
-            from app.schemas.video import VideoUpdate
-            update_data = VideoUpdate(
-                video_url=video_url,
-                status="completed"
-            )
-            update_video(db, int(str(video.id)), update_data)
-        
-        db.close()
-        
-        return {"status": "success", "video_id": video.id if video else None, "video_url": video_url}
+        with session_scope() as db:
+            product = get_product_by_id(db, product_id)
+            if not product:
+                return {"status": "error", "message": f"Product with ID {product_id} not found"}
+            
+            # Generate script
+            script = run_async(generate_video_script(product))
+            
+            # Create video using AI avatar
+            avatar_settings = {
+                "title": f"Product Demo Video {product_id}",
+                "description": "AI Generated Product Demo",
+                "ratio": "16:9",
+                "avatar_id": "default_avatar",
+                "voice_id": "default_voice",
+                "background": "default_background"
+            }
+            
+            # Create avatar video
+            video_url = run_async(create_avatar_video(script, avatar_settings))
+            
+            # Save the rendered video to the database
+            video = run_async(create_video_for_product(product_id, db, video_url=video_url, script=script))
+            
+            return {"status": "success", "video_id": video.id if video else None, "video_url": video_url}
     except Exception as e:
         # Update video status to failed
         try:
-            db = SessionLocal()
-            from app.services.video_generation import get_video_by_id, update_video
-            from app.schemas.video import VideoUpdate
-            video = get_video_by_id(db, product_id)  # Assuming product_id is used as video_id for simplicity
-            if video:
-                update_data = VideoUpdate(
-                    status="failed"
-                )
-                update_video(db, int(str(video.id)), update_data)
-            db.close()
+            with session_scope() as db:
+                video = get_video_by_id(db, product_id)  # Assuming product_id is used as video_id for simplicity
+                if video:
+                    update_data = VideoUpdate(
+                        status="failed"
+                    )
+                    update_video(db, cast(int, video.id), update_data)
         except Exception:
             pass  # Ignore errors in error handling
         
@@ -116,42 +146,32 @@ def publish_video_task(video_id: int, platforms: list):
     """
     Celery task to publish a video to social media platforms
     """
-    # Import here to avoid circular imports
-    from app.services.social_media_publisher import (
-        publish_to_tiktok,
-        publish_to_instagram,
-        publish_to_youtube
-    )
-    from app.services.video_generation import get_video_by_id
-    from app.core.database import SessionLocal
-    
     try:
         # Get video details
-        db = SessionLocal()
-        video = get_video_by_id(db, video_id)
-        db.close()
-        
-        if not video:
-            return {"status": "error", "message": f"Video with ID {video_id} not found"}
+        with session_scope() as db:
+            video = get_video_by_id(db, video_id)
+            
+            if not video:
+                return {"status": "error", "message": f"Video with ID {video_id} not found"}
+            
+            # Get video details, handling SQLAlchemy column objects
+            video_url = str(getattr(video, 'video_url', None) or "https://example.com/sample-video.mp4")
+            title = str(getattr(video, 'title', None) or "Untitled Video")
+            description = str(getattr(video, 'description', None) or "Check out this amazing product!")
         
-        # Get video details, handling SQLAlchemy column objects
-        video_url = str(getattr(video, 'video_url', None) or "https://example.com/sample-video.mp4")
-        title = str(getattr(video, 'title', None) or "Untitled Video")
-        description = str(getattr(video, 'description', None) or "Check out this amazing product!")
+        publishers = {
+            "tiktok": lambda: publish_to_tiktok(video_url, description),
+            "instagram": lambda: publish_to_instagram(video_url, description),
+            "youtube": lambda: publish_to_youtube(video_url, title, description),
+        }
         
-        results = []
+        # Publish to every requested platform concurrently
+        async def publish_all() -> list:
+            return list(await asyncio.gather(
+                *(publishers[platform]() for platform in platforms if platform in publishers)
+            ))
         
-        # Publish to each platform
-        for platform in platforms:
-            if platform == "tiktok":
-                result = publish_to_tiktok(video_url, description)
-                results.append(result)
-            elif platform == "instagram":
-                result = publish_to_instagram(video_url, description)
-                results.append(result)
-            elif platform == "youtube":
-                result = publish_to_youtube(video_url, title, description)
-                results.append(result)
+        results = run_async(publish_all())
         
         return {"status": "success", "results": results}
     except Exception as e:
@@ -163,17 +183,10 @@ def execute_full_workflow_task():
     """
     Celery task to execute the full content workflow
     """
-    # Import here to avoid circular imports
-    from app.services.content_workflow import execute_full_content_workflow
-    from app.core.database import SessionLocal
-    
     try:
-        db = SessionLocal()
-        import asyncio
-        # Run the async workflow in a new event loop
-        result = asyncio.run(execute_full_content_workflow(db))
-        db.close()
-        return result
+        with session_scope() as db:
+            # Run the async workflow on the worker event loop
+            return run_async(execute_full_content_workflow(db))
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -183,17 +196,10 @@ def create_content_for_product_task(product_id: int):
     """
     Celery task to create content for a specific product
     """
-    # Import here to avoid circular imports
-    from app.services.content_workflow import create_content_for_product
-    from app.core.database import SessionLocal
-    
     try:
-        db = SessionLocal()
-        import asyncio
-        # Run the async workflow in a new event loop
-        result = asyncio.run(create_content_for_product(db, product_id))
-        db.close()
-        return result
+        with session_scope() as db:
+            # Run the async workflow on the worker event loop
+            return run_async(create_content_for_product(db, product_id))
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -203,17 +209,13 @@ def scheduled_trend_discovery_task():
     """
     Celery task for scheduled trend discovery (to be run periodically)
     """
-    from app.services.product_discovery import discover_trending_products
-    from app.core.database import SessionLocal
-    
     try:
-        db = SessionLocal()
-        products = discover_trending_products(db)
-        db.close()
-        return {
-            "status": "success", 
-            "message": f"Discovered {len(products)} trending products",
-            "products": [p.name for p in products]
-        }
+        with session_scope() as db:
+            products = run_async(discover_trending_products(db))
+            return {
+                "status": "success", 
+                "message": f"Discovered {len(products)} trending products",
+                "products": [p.name for p in products]
+            }
     except Exception as e:
         return {"status": "error", "message": str(e)}
\ No newline at end of file
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Content Factory AI - Command line entry point
+
+Runs one or more of the setup/check scripts in a single interpreter, so settings,
+the database engine and the app modules are imported once for all of them:
+
+    python cli.py setup-db test-connection test-openai
+"""
+import argparse
+import asyncio
+import sys
+
+
+def _setup_db() -> bool:
+    import setup_db
+    return setup_db.main()
+
+
+def _test_connection() -> bool:
+    import test_connection
+    return asyncio.run(test_connection.main())
+
+
+def _test_openai() -> bool:
+    import test_openai_setup
+    return asyncio.run(test_openai_setup.test_openai_api())
+
+
+def _test_setup() -> bool:
+    import test_basic_setup
+    return asyncio.run(test_basic_setup.main())
+
+
+def _run() -> bool:
+    import run
+    run.main()
+    return True
+
+
+COMMANDS = {
+    "setup-db": _setup_db,
+    "test-connection": _test_connection,
+    "test-openai": _test_openai,
+    "test-setup": _test_setup,
+    "run": _run,
+}
+
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description="Content Factory AI helper commands")
+    parser.add_argument("commands", nargs="+", choices=COMMANDS, metavar="command",
+                        help=f"one or more of: {', '.join(COMMANDS)}")
+    args = parser.parse_args()
+
+    # Run every requested command, even after a failure, and report overall success
+    results = [COMMANDS[command]() for command in args.commands]
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
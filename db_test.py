@@ -1,15 +1,12 @@
 from app.core.config import settings
-from app.core.database import engine
-from sqlalchemy import text
+from app.core.database import ping
 
 print("DATABASE_URL:", settings.DATABASE_URL)
 print("Testing database connection...")
 
 try:
     # Try to connect to the database
-    with engine.connect() as connection:
-        result = connection.execute(text("SELECT 1"))
+    if ping():
         print("Database connection successful!")
-        print("Result:", result.fetchone())
 except Exception as e:
     print("Database connection failed:", str(e))
\ No newline at end of file
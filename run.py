@@ -30,6 +30,10 @@ def check_environment():
     
     return True
 
+def is_production() -> bool:
+    """Production mode is selected with --prod or ENVIRONMENT=production"""
+    return "--prod" in sys.argv[1:] or settings.ENVIRONMENT.lower() == "production"
+
 def main():
     """Main application runner"""
     print("🚀 Starting Content Factory AI...")
@@ -38,22 +42,47 @@ def main():
     if not check_environment():
         sys.exit(1)
     
+    production = is_production()
+    
     try:
         print("✅ Application loaded successfully")
         print("📡 Starting server on http://localhost:8000")
         print("📚 API documentation available at http://localhost:8000/docs")
         print("🔍 Alternative docs at http://localhost:8000/redoc")
-        print("\n⏹️  Press Ctrl+C to stop the server\n")
         
-        # Start the server
-        uvicorn.run(
-            "app.main:app",
-            host="0.0.0.0",
-            port=8000,
-            reload=True,
-            workers=1,
-            log_level="info"
-        )
+        if production:
+            # One process per core, uvloop/httptools instead of the pure-Python loop and
+            # parser, and no per-request access log formatting
+            workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+            print(f"🏭 Production mode: {workers} workers (uvloop + httptools, access log off)")
+            print("   For zero-downtime worker restarts run under gunicorn instead:")
+            print(f"   gunicorn app.main:app -k uvicorn.workers.UvicornWorker -w {workers} --bind 0.0.0.0:8000")
+            print("\n⏹️  Press Ctrl+C to stop the server\n")
+            
+            uvicorn.run(
+                "app.main:app",
+                host="0.0.0.0",
+                port=8000,
+                reload=False,
+                workers=workers,
+                loop="uvloop",
+                http="httptools",
+                log_level="warning",
+                access_log=False,
+                log_config=None
+            )
+        else:
+            print("🔄 Development mode: auto-reload on (pass --prod or set ENVIRONMENT=production for workers)")
+            print("\n⏹️  Press Ctrl+C to stop the server\n")
+            
+            uvicorn.run(
+                "app.main:app",
+                host="0.0.0.0",
+                port=8000,
+                reload=True,
+                workers=1,
+                log_level="info"
+            )
         
     except ImportError as e:
         print(f"❌ Error importing application: {e}")
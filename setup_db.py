@@ -10,34 +10,45 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-try:
-    from app.core.database import Base, engine
-    from app.models import product, video, social_media
+def main() -> bool:
+    """Create any missing tables and verify the connection"""
+    try:
+        from app.core.database import Base, engine, ping
+        from app.models import product, video, social_media
     
-    print("Creating database tables...")
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created successfully!")
+        from sqlalchemy import inspect
     
-    # Test the connection
-    from app.core.database import SessionLocal
-    from sqlalchemy import text
-    db = SessionLocal()
-    try:
-        # Try a simple query to test connection
-        result = db.execute(text("SELECT 1"))
-        print("✅ Database connection verified!")
-    except Exception as e:
-        print(f"⚠️  Database connection test failed: {e}")
-    finally:
-        db.close()
+        print("Creating database tables...")
+        # Look up existing tables once instead of letting create_all probe each table,
+        # then issue all the DDL in a single transaction
+        with engine.begin() as connection:
+            existing = set(inspect(connection).get_table_names())
+            missing = [table for table in Base.metadata.sorted_tables if table.name not in existing]
+            Base.metadata.create_all(bind=connection, tables=missing, checkfirst=False)
+        if missing:
+            print(f"✅ Created {len(missing)} table(s): {', '.join(table.name for table in missing)}")
+        else:
+            print("✅ Database tables already exist")
+    
+        # Test the connection (reuses the pooled connection create_all just returned)
+        try:
+            ping()
+            print("✅ Database connection verified!")
+        except Exception as e:
+            print(f"⚠️  Database connection test failed: {e}")
         
-except Exception as e:
-    print(f"❌ Error setting up database: {e}")
-    print("\nTroubleshooting tips:")
-    print("1. Check your Supabase credentials in .env file")
-    print("2. Verify your Supabase project is active")
-    print("3. Ensure your internet connection is working")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
\ No newline at end of file
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error setting up database: {e}")
+        print("\nTroubleshooting tips:")
+        print("1. Check your Supabase credentials in .env file")
+        print("2. Verify your Supabase project is active")
+        print("3. Ensure your internet connection is working")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
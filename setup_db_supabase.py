@@ -12,6 +12,7 @@ sys.path.insert(0, str(project_root))
 try:
     from supabase import create_client
     from app.core.config import settings
+    from app.core.supabase_client import check_tables
     
     print("Connecting to Supabase...")
     client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
@@ -68,44 +69,50 @@ try:
     CREATE INDEX IF NOT EXISTS idx_videos_status ON videos(status);
     CREATE INDEX IF NOT EXISTS idx_social_posts_video ON social_media_posts(video_id);
     CREATE INDEX IF NOT EXISTS idx_social_posts_platform ON social_media_posts(platform);
+
+    -- Report which of the given public tables exist, in one call (used by app.core.supabase_client.check_tables)
+    CREATE OR REPLACE FUNCTION check_tables(names text[]) RETURNS jsonb AS $$
+        SELECT jsonb_object_agg(n, to_regclass('public.' || n) IS NOT NULL) FROM unnest(names) AS n
+    $$ LANGUAGE sql STABLE;
     """
     
-    print("\n" + "="*60)
-    print("📋 SUPABASE SQL SETUP INSTRUCTIONS")
-    print("="*60)
-    print("\nSince we're experiencing encoding issues with direct connection,")
-    print("please follow these steps to create your database tables:\n")
-    print("1. Go to: https://supabase.com/dashboard/project/qcmmqmqerjyfvftdlttv/sql")
-    print("2. Click 'New Query'")
-    print("3. Copy the SQL below and paste it into the editor")
-    print("4. Click 'Run'\n")
-    print("="*60)
-    print("SQL TO RUN:")
-    print("="*60)
-    print(create_tables_sql)
-    print("="*60)
-    print("\nAfter running the SQL, press Enter to continue...")
-    input()
-    
-    # Test if tables were created
-    print("\nTesting database tables...")
+    # Run the DDL server-side in one call; this needs an exec_sql(sql text) function in
+    # the database, so fall back to pasting the SQL by hand when it isn't there
     try:
-        result = client.table('products').select("*").limit(1).execute()
-        print("✅ Products table exists!")
+        client.postgrest.rpc("exec_sql", {"sql": create_tables_sql}).execute()
+        print("✅ Database tables created via exec_sql")
     except Exception as e:
-        print(f"⚠️ Products table not found: {e}")
+        print(f"⚠️ Could not run the SQL through exec_sql: {e}")
+        print("\n" + "="*60)
+        print("📋 SUPABASE SQL SETUP INSTRUCTIONS")
+        print("="*60)
+        print("\nSince we're experiencing encoding issues with direct connection,")
+        print("please follow these steps to create your database tables:\n")
+        print("1. Go to: https://supabase.com/dashboard/project/qcmmqmqerjyfvftdlttv/sql")
+        print("2. Click 'New Query'")
+        print("3. Copy the SQL below and paste it into the editor")
+        print("4. Click 'Run'\n")
+        print("="*60)
+        print("SQL TO RUN:")
+        print("="*60)
+        print(create_tables_sql)
+        print("="*60)
+        print("\nAfter running the SQL, press Enter to continue...")
+        input()
     
-    try:
-        result = client.table('videos').select("*").limit(1).execute()
-        print("✅ Videos table exists!")
-    except Exception as e:
-        print(f"⚠️ Videos table not found: {e}")
-        
-    try:
-        result = client.table('social_media_posts').select("*").limit(1).execute()
-        print("✅ Social media posts table exists!")
-    except Exception as e:
-        print(f"⚠️ Social media posts table not found: {e}")
+    # Test if tables were created, all in one round trip where the database allows it
+    print("\nTesting database tables...")
+    tables = {
+        "products": "Products",
+        "videos": "Videos",
+        "social_media_posts": "Social media posts",
+    }
+    
+    for label, error in zip(tables.values(), check_tables(client, list(tables))):
+        if error is None:
+            print(f"✅ {label} table exists!")
+        else:
+            print(f"⚠️ {label} table not found: {error}")
     
     print("\n✅ Database setup complete!")
     print("You can now run the application with: python run.py")
@@ -4,12 +4,27 @@ Content Factory AI - Project Setup Script
 This script sets up the project environment and verifies all components.
 """
 
+import asyncio
+import contextvars
+import mmap
 import os
+import re
 import sys
-import subprocess
 import platform
 from pathlib import Path
 
+REQUIRED_ENV_VARS = ["SUPABASE_URL", "SUPABASE_KEY", "OPENAI_API_KEY"]
+
+# Matches a required variable still set to the .env.example placeholder
+PLACEHOLDER_PATTERN = re.compile(
+    rb"^(" + b"|".join(var.encode() for var in REQUIRED_ENV_VARS) + rb")=(?:your_|https://your-)",
+    re.MULTILINE
+)
+
+# Number of the step running in the current task, so output streamed by concurrent
+# steps can be told apart
+current_step = contextvars.ContextVar("current_step", default=None)
+
 def print_header(message):
     print("\n" + "="*60)
     print(f" {message}")
@@ -19,21 +34,27 @@ def print_step(step, message):
     print(f"\nStep {step}: {message}")
     print("-" * 40)
 
-def run_command(command, check=True, shell=True):
-    """Run a command and return the result"""
+async def run_command(command):
+    """Run a command, streaming its output as it arrives, and return whether it succeeded"""
+    number = current_step.get()
+    prefix = f"  [{number}] " if number is not None else "  "
     try:
-        result = subprocess.run(
-            command, 
-            shell=shell, 
-            check=check, 
-            capture_output=True, 
-            text=True
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
         )
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.CalledProcessError as e:
-        return False, "", str(e)
+    except OSError as e:
+        print(f"{prefix}{e}")
+        return False
+    
+    # Every line has already been shown by the time a step fails, so nothing is kept to repeat
+    async for raw_line in process.stdout:
+        print(f"{prefix}{raw_line.decode(errors='replace').rstrip()}")
+    await process.wait()
+    return process.returncode == 0
 
-def check_python_version():
+async def check_python_version():
     """Check if Python version is 3.10+"""
     version = sys.version_info
     if version.major == 3 and version.minor >= 10:
@@ -44,7 +65,7 @@ def check_python_version():
         print("  Python 3.10+ is required")
         return False
 
-def setup_virtual_environment():
+async def setup_virtual_environment():
     """Create and set up virtual environment"""
     venv_path = Path("venv")
     
@@ -53,16 +74,16 @@ def setup_virtual_environment():
         return True
     
     print("Creating virtual environment...")
-    success, stdout, stderr = run_command([sys.executable, "-m", "venv", "venv"])
+    success = await run_command([sys.executable, "-m", "venv", "venv"])
     
     if success:
         print("✓ Virtual environment created successfully")
         return True
     else:
-        print(f"✗ Failed to create virtual environment: {stderr}")
+        print("✗ Failed to create virtual environment (see output above)")
         return False
 
-def install_dependencies():
+async def install_dependencies():
     """Install project dependencies"""
     # Determine the correct pip path based on OS
     if platform.system() == "Windows":
@@ -75,16 +96,28 @@ def install_dependencies():
         return False
     
     print("Installing dependencies...")
-    success, stdout, stderr = run_command([str(pip_path), "install", "-r", "requirements.txt"])
+    # Prefer wheels and skip byte-compiling at install time; modules compile on first import
+    success = await run_command([
+        str(pip_path), "install", "--prefer-binary", "--no-compile", "-r", "requirements.txt"
+    ])
     
     if success:
         print("✓ Dependencies installed successfully")
         return True
     else:
-        print(f"✗ Failed to install dependencies: {stderr}")
+        print("✗ Failed to install dependencies (see output above)")
         return False
 
-def check_env_file():
+def find_placeholder_vars(env_path):
+    """Return the required variables that still hold their placeholder value"""
+    with open(env_path, "rb") as f:
+        # mmap refuses empty files, and an empty file has no placeholders anyway
+        if os.fstat(f.fileno()).st_size == 0:
+            return set()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {match.group(1).decode() for match in PLACEHOLDER_PATTERN.finditer(mm)}
+
+async def check_env_file():
     """Check if .env file exists and has basic configuration"""
     env_path = Path(".env")
     
@@ -92,17 +125,8 @@ def check_env_file():
         print("✗ .env file not found")
         return False
     
-    with open(env_path, 'r') as f:
-        content = f.read()
-    
-    required_vars = [
-        "SUPABASE_URL", "SUPABASE_KEY", "OPENAI_API_KEY"
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if f"{var}=your_" in content or f"{var}=https://your-" in content:
-            missing_vars.append(var)
+    found = await asyncio.to_thread(find_placeholder_vars, env_path)
+    missing_vars = [var for var in REQUIRED_ENV_VARS if var in found]
     
     if missing_vars:
         print(f"⚠ .env file exists but needs configuration for: {', '.join(missing_vars)}")
@@ -111,7 +135,7 @@ def check_env_file():
         print("✓ .env file configured")
         return True
 
-def setup_database():
+async def setup_database():
     """Set up database tables"""
     # Determine the correct python path based on OS
     if platform.system() == "Windows":
@@ -124,16 +148,16 @@ def setup_database():
         return False
     
     print("Setting up database tables...")
-    success, stdout, stderr = run_command([str(python_path), "setup_db.py"])
+    success = await run_command([str(python_path), "setup_db.py"])
     
     if success:
         print("✓ Database tables created successfully")
         return True
     else:
-        print(f"⚠ Database setup failed (this is expected if Supabase credentials are not configured): {stderr}")
+        print("⚠ Database setup failed (this is expected if Supabase credentials are not configured)")
         return False
 
-def test_application():
+async def test_application():
     """Test if the application can start"""
     # Determine the correct python path based on OS
     if platform.system() == "Windows":
@@ -147,7 +171,7 @@ def test_application():
     
     print("Testing application startup...")
     # Test import of main modules
-    success, stdout, stderr = run_command([
+    success = await run_command([
         str(python_path), "-c", 
         "from app.main import app; from app.core.config import settings; print('✓ Application modules load successfully')"
     ])
@@ -156,9 +180,40 @@ def test_application():
         print("✓ Application can be imported successfully")
         return True
     else:
-        print(f"✗ Application import failed: {stderr}")
+        print("✗ Application import failed (see output above)")
         return False
 
+async def run_steps():
+    """Run the setup steps concurrently where they don't depend on each other
+
+    Returns the number of steps that succeeded.
+    """
+    async def step(number, message, check):
+        print_step(number, message)
+        # gather() gives each step its own task, and so its own copy of the context
+        current_step.set(number)
+        return await check()
+    
+    async def prepare_environment():
+        # Dependencies go into the virtual environment, so these two stay in order
+        venv_ok = await step(2, "Setting up virtual environment", setup_virtual_environment)
+        deps_ok = await step(3, "Installing dependencies", install_dependencies)
+        return [venv_ok, deps_ok]
+    
+    python_ok, env_ok, environment = await asyncio.gather(
+        step(1, "Checking Python version", check_python_version),
+        step(4, "Checking environment configuration", check_env_file),
+        prepare_environment()
+    )
+    
+    # Both of these run in the virtual environment, but not on each other
+    later = await asyncio.gather(
+        step(5, "Setting up database", setup_database),
+        step(6, "Testing application", test_application)
+    )
+    
+    return sum([python_ok, env_ok, *environment, *later])
+
 def main():
     """Main setup function"""
     print_header("Content Factory AI - Project Setup")
@@ -167,38 +222,8 @@ def main():
     script_dir = Path(__file__).parent
     os.chdir(script_dir)
     
-    success_count = 0
     total_steps = 6
-    
-    # Step 1: Check Python version
-    print_step(1, "Checking Python version")
-    if check_python_version():
-        success_count += 1
-    
-    # Step 2: Set up virtual environment
-    print_step(2, "Setting up virtual environment")
-    if setup_virtual_environment():
-        success_count += 1
-    
-    # Step 3: Install dependencies
-    print_step(3, "Installing dependencies")
-    if install_dependencies():
-        success_count += 1
-    
-    # Step 4: Check environment configuration
-    print_step(4, "Checking environment configuration")
-    if check_env_file():
-        success_count += 1
-    
-    # Step 5: Set up database
-    print_step(5, "Setting up database")
-    if setup_database():
-        success_count += 1
-    
-    # Step 6: Test application
-    print_step(6, "Testing application")
-    if test_application():
-        success_count += 1
+    success_count = asyncio.run(run_steps())
     
     # Final report
     print_header("Setup Complete!")
@@ -4,6 +4,7 @@ Basic Setup Test - Content Factory AI
 This script tests if the basic setup works without requiring all API keys.
 """
 
+import asyncio
 import sys
 import os
 from pathlib import Path
@@ -45,16 +46,15 @@ def test_imports():
     
     return True
 
-def test_basic_functionality():
+async def test_basic_functionality():
     """Test basic functionality without API keys"""
     print("\nTesting basic functionality...")
     
     try:
         # Test product discovery (uses free API)
-        import asyncio
         from app.services.product_discovery import discover_trending_products_from_api
         
-        products = asyncio.run(discover_trending_products_from_api())
+        products = await discover_trending_products_from_api()
         if products and len(products) > 0:
             print(f"✓ Product discovery works ({len(products)} products found)")
         else:
@@ -87,38 +87,34 @@ def test_basic_functionality():
     
     return True
 
-def test_api_endpoints():
+async def test_api_endpoints():
     """Test if API endpoints can be accessed"""
     print("\nTesting API endpoints...")
     
     try:
-        from fastapi.testclient import TestClient
-        from app.main import app
+        from api_probe import probe_endpoints
         
-        client = TestClient(app)
+        root, health, products = await probe_endpoints("/", "/health", "/api/v1/products/")
         
         # Test root endpoint
-        response = client.get("/")
-        if response.status_code == 200:
+        if root.status_code == 200:
             print("✓ Root endpoint works")
         else:
-            print(f"✗ Root endpoint failed: {response.status_code}")
+            print(f"✗ Root endpoint failed: {root.status_code}")
             return False
         
         # Test health endpoint
-        response = client.get("/health")
-        if response.status_code in [200, 500]:  # 500 is ok if DB not configured
+        if health.status_code in [200, 500]:  # 500 is ok if DB not configured
             print("✓ Health endpoint accessible")
         else:
-            print(f"✗ Health endpoint failed: {response.status_code}")
+            print(f"✗ Health endpoint failed: {health.status_code}")
             return False
         
         # Test products endpoint
-        response = client.get("/api/v1/products/")
-        if response.status_code in [200, 500]:  # 500 is ok if DB not configured
+        if products.status_code in [200, 500]:  # 500 is ok if DB not configured
             print("✓ Products API endpoint accessible")
         else:
-            print(f"✗ Products endpoint failed: {response.status_code}")
+            print(f"✗ Products endpoint failed: {products.status_code}")
             return False
         
         return True
@@ -127,7 +123,7 @@ def test_api_endpoints():
         print(f"✗ API endpoint testing failed: {e}")
         return False
 
-def main():
+async def main():
     """Main test function"""
     print("=" * 60)
     print(" Content Factory AI - Basic Setup Test")
@@ -145,11 +141,11 @@ def main():
         tests_passed += 1
     
     # Test 2: Basic functionality
-    if test_basic_functionality():
+    if await test_basic_functionality():
         tests_passed += 1
     
     # Test 3: API endpoints
-    if test_api_endpoints():
+    if await test_api_endpoints():
         tests_passed += 1
     
     # Final report
@@ -174,7 +170,7 @@ def main():
 
 if __name__ == "__main__":
     try:
-        success = main()
+        success = asyncio.run(main())
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\nTest interrupted by user")
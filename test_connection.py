@@ -2,6 +2,7 @@
 """
 Test database connection and API functionality
 """
+import asyncio
 import sys
 from pathlib import Path
 
@@ -24,13 +25,13 @@ def test_config():
 def test_database_connection():
     """Test database connection"""
     try:
-        from app.core.database import engine, SessionLocal
+        from app.core.database import ping
         
         # Test connection
-        with engine.connect() as conn:
-            result = conn.execute("SELECT 1 as test")
+        if ping():
             print("✅ Database connection successful")
             return True
+        return False
             
     except Exception as e:
         print(f"⚠️  Database connection failed: {e}")
@@ -40,10 +41,9 @@ def test_database_connection():
 def test_supabase_direct():
     """Test Supabase connection using supabase client"""
     try:
-        from supabase import create_client, Client
-        from app.core.config import settings
+        from app.core.supabase_client import get_supabase_client
         
-        supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        supabase = get_supabase_client()
         
         # Try to access a table (this will fail gracefully if tables don't exist)
         try:
@@ -60,14 +60,12 @@ def test_supabase_direct():
         print(f"❌ Supabase client connection failed: {e}")
         return False
 
-def test_api_startup():
+async def test_api_startup():
     """Test if API can start"""
     try:
-        from app.main import app
-        from fastapi.testclient import TestClient
+        from api_probe import probe_endpoints
         
-        client = TestClient(app)
-        response = client.get("/")
+        response, = await probe_endpoints("/")
         
         if response.status_code == 200:
             print("✅ API startup successful")
@@ -80,7 +78,7 @@ def test_api_startup():
         print(f"❌ API startup failed: {e}")
         return False
 
-def main():
+async def main():
     """Run all tests"""
     print("🧪 Testing Content Factory AI Setup")
     print("=" * 50)
@@ -97,7 +95,8 @@ def main():
     
     for name, test_func in tests:
         print(f"\n🔍 Testing {name}...")
-        if test_func():
+        ok = await test_func() if asyncio.iscoroutinefunction(test_func) else test_func()
+        if ok:
             passed += 1
     
     print("\n" + "=" * 50)
@@ -119,5 +118,5 @@ def main():
     return passed >= 3
 
 if __name__ == "__main__":
-    success = main()
+    success = asyncio.run(main())
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -29,7 +29,8 @@ async def test_openai_api():
     
     try:
         print("🔄 Testing API call...")
-        result = await call_ai_script_generation_api(test_prompt)
+        # A streamed, token-capped call is enough to prove the key and model work
+        result = await call_ai_script_generation_api(test_prompt, probe=True)
         
         if result.startswith("Error"):
             print(f"❌ API call failed: {result}")
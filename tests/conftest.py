@@ -2,46 +2,101 @@
 Pytest configuration for the AI Content Factory application
 """
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, configure_mappers
 from sqlalchemy.pool import StaticPool
 
 from app.core.database import Base
 from app.core.config import settings
+from app.models.product import Product
+from app.models.video import Video
+from app.schemas.product import ProductCreate
+from app.services.product_discovery import create_product
+
+SEEDED_PRODUCT = ProductCreate(
+    name="Test Product for Workflow",
+    description="A test product for workflow testing",
+    price="$29.99",
+    url="https://example.com/test-product-workflow",
+    image_url="https://example.com/test-product-workflow.jpg",
+    is_trending=True
+)
 
 
 @pytest.fixture(scope="session")
-def test_db():
-    """Create a test database"""
-    # Use an in-memory SQLite database for testing
+def engine():
+    """Create the test database engine and schema once per test run"""
+    # Use a named in-memory SQLite database for testing; the shared cache lets any other
+    # engine in this process open the same database
     engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
+        "sqlite:///file:cf_test?mode=memory&cache=shared&uri=true",
+        connect_args={"check_same_thread": False, "uri": True},
         poolclass=StaticPool,
     )
     
-    # Create all tables in the correct order to handle foreign keys
-    # Import all models to ensure they are registered with Base
-    from app.models import product, video
+    @event.listens_for(engine, "connect")
+    def configure_sqlite(dbapi_connection, connection_record):
+        # pysqlite's own transaction handling breaks SAVEPOINTs; let SQLAlchemy emit BEGIN itself
+        dbapi_connection.isolation_level = None
+        # Nothing needs to survive the test run, so skip durability work entirely
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.close()
+    
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    # Import all models to ensure they are registered with Base, then configure the
+    # mappers now rather than inside whichever test first touches the ORM
+    from app.models import product, video, social_media
+    configure_mappers()
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
     
-    # Create a session
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Flush one row per model and roll it back, so the ORM INSERTs are compiled and in the
+    # statement cache before the first test creates anything
+    with Session(bind=engine) as session:
+        session.add_all([
+            Product(name="_warm", url="https://example.com/_warm"),
+            Video(title="_warm", script="_warm"),
+        ])
+        session.flush()
+        session.rollback()
     
-    db = TestingSessionLocal()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def connection(engine):
+    """Open the connection every test session is bound to"""
+    with engine.connect() as connection:
+        yield connection
+
+
+@pytest.fixture(scope="function")
+def db(connection):
+    """
+    Create a database session for each test inside an outer transaction
+
+    Commits made by the code under test only release a SAVEPOINT, and the outer
+    transaction is rolled back afterwards, so every test starts from the same empty schema.
+    """
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
     try:
-        yield db
+        yield session
     finally:
-        db.close()
+        session.close()
+        transaction.rollback()
 
 
 @pytest.fixture(scope="function")
-def db(test_db):
-    """Create a database session for each test"""
-    # Begin a transaction
-    test_db.begin()
-    yield test_db
-    # Rollback the transaction after each test
-    test_db.rollback()
\ No newline at end of file
+def seeded_product(db):
+    """A trending product already saved in the test database"""
+    return create_product(db, SEEDED_PRODUCT)
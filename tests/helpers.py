@@ -0,0 +1,19 @@
+"""
+Shared test helpers for the AI Content Factory application
+"""
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+
+
+def bulk_create_products(db: Session, specs: List[Dict[str, Any]]) -> List[Product]:
+    """
+    Insert many products with one executemany and return them in ``specs`` order
+
+    The caller decides when to commit.
+    """
+    statement = insert(Product).returning(Product, sort_by_parameter_order=True)
+    return list(db.scalars(statement, specs))
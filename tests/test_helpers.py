@@ -0,0 +1,17 @@
+"""
+Helper function tests for the AI Content Factory application
+"""
+import pytest
+
+from app.utils.helpers import extract_domain
+
+
+@pytest.mark.parametrize("url, domain", [
+    ("https://www.example.com/product?id=1", "example.com"),
+    ("http://shop.example.com:8080/item", "shop.example.com"),
+    ("not a url", "not a url"),
+    ("http://[::1", "http://[::1"),
+], ids=["www", "port", "no-scheme", "malformed-ipv6"])
+def test_extract_domain(url: str, domain: str):
+    """Test extracting domains, including from malformed URLs"""
+    assert extract_domain(url) == domain
@@ -1,6 +1,8 @@
 """
 Product tests for the AI Content Factory application
 """
+from typing import cast
+
 import pytest
 from sqlalchemy.orm import Session
 
@@ -9,42 +11,34 @@ from app.schemas.product import ProductCreate
 from app.services.product_discovery import create_product, get_product_by_id
 
 
-def test_create_product(db: Session):
-    """Test creating a product"""
-    product_data = ProductCreate(
-        name="Test Product",
-        description="A test product",
-        price="$19.99",
-        url="https://example.com/test-product",
-        image_url="https://example.com/test-product.jpg",
-        is_trending=True
-    )
-    
-    product = create_product(db, product_data)
-    
-    assert product.name == "Test Product"
-    assert product.description == "A test product"
-    assert product.price == "$19.99"
-    assert product.url == "https://example.com/test-product"
-    assert product.is_trending is True
+# Built once at import; create_product only reads them
+TEST_PRODUCT = ProductCreate(
+    name="Test Product",
+    description="A test product",
+    price="$19.99",
+    url="https://example.com/test-product",
+    image_url="https://example.com/test-product.jpg",
+    is_trending=True
+)
+TEST_PRODUCT_2 = ProductCreate(
+    name="Test Product 2",
+    description="Another test product",
+    price="$29.99",
+    url="https://example.com/test-product-2",
+    image_url="https://example.com/test-product-2.jpg"
+)
 
 
-def test_get_product_by_id(db: Session):
-    """Test retrieving a product by ID"""
-    # First create a product
-    product_data = ProductCreate(
-        name="Test Product 2",
-        description="Another test product",
-        price="$29.99",
-        url="https://example.com/test-product-2",
-        image_url="https://example.com/test-product-2.jpg"
-    )
+@pytest.mark.parametrize("payload", [TEST_PRODUCT, TEST_PRODUCT_2], ids=["trending", "defaults"])
+def test_create_and_get_product(db: Session, payload: ProductCreate):
+    """Test creating a product and retrieving it by ID"""
+    product = create_product(db, payload)
     
-    created_product = create_product(db, product_data)
+    for field, value in payload.model_dump().items():
+        assert getattr(product, field) == value
     
-    # Then retrieve it
-    retrieved_product = get_product_by_id(db, created_product.id)
+    retrieved_product = get_product_by_id(db, cast(int, product.id))
     
     assert retrieved_product is not None
-    assert retrieved_product.id == created_product.id
-    assert retrieved_product.name == "Test Product 2"
\ No newline at end of file
+    assert retrieved_product.id == product.id
+    assert retrieved_product.name == payload.name